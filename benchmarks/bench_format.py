@@ -0,0 +1,75 @@
+# Micro-benchmark of summary table rendering: per-row formatting vs the vectorized path.
+#
+#   python benchmarks/bench_format.py --rows 10000 50000
+import argparse
+import os
+import sys
+import timeit
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from sales_views import create_df_str
+from sales_format import format_BM
+
+
+def legacy_add_BM(height, till=0, dol='$'):
+    if height >= 1_000_000_000:
+        label = f'{dol}{height // 1_000_000_000:.0f},{(height/10_000_000):.{till}f}M'
+    elif height >= 1_000_000:
+        label = f'{dol}{height / 1_000_000:.{till}f}M'
+    else:
+        label = f'{dol}{height / 1_000_000:.1f}M' if height != 0 else f'{dol}{0}'
+    return label
+
+
+def legacy_create_df_str(table_name, dataframe, col1_name, all_column_names, col_width):
+    header = f'| {col1_name:<{col_width}}|  '
+    for col in all_column_names:
+        header += f'{col:<{col_width}}|  '
+    separator = '+' + '-' * (len(header) - 4) + '+'
+    rows = [table_name, separator, header, separator]
+    for i, row in dataframe.iterrows():
+        row_str = f'| {i:<{col_width}}|  '
+        for col in all_column_names:
+            row_str += f'{str(row[col]):<{col_width}}|  '
+        rows.append(row_str)
+    return '\n'.join(rows) + '\n' + separator
+
+
+def legacy_table(df):
+    table = df.copy()
+    for col in table.columns:
+        table[col] = table[col].apply(lambda x: legacy_add_BM(x, 2))
+    return legacy_create_df_str('Table:', table, 'Country', table.columns, 12)
+
+
+def vectorized_table(df):
+    table = format_BM(df, 2)
+    return create_df_str('Table:', table, 'Country', table.columns, 12)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summary table rendering benchmark")
+    parser.add_argument('--rows', type=int, nargs='+', default=[100, 1_000, 10_000])
+    parser.add_argument('--cols', type=int, default=12)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'rows':>8}{'cells':>10}{'per row':>12}{'vectorized':>12}{'speedup':>10}")
+    for rows in args.rows:
+        df = pd.DataFrame(rng.lognormal(14, 2, (rows, args.cols)),
+                          index=[f'row {i}' for i in range(rows)],
+                          columns=[f'col {i}' for i in range(args.cols)])
+        assert legacy_table(df) == vectorized_table(df)
+
+        number = max(1, 10_000 // rows)
+        old = min(timeit.repeat(lambda: legacy_table(df), number=number, repeat=args.repeat)) / number
+        new = min(timeit.repeat(lambda: vectorized_table(df), number=number, repeat=args.repeat)) / number
+        print(f'{rows:>8,}{rows * args.cols:>10,}{old * 1000:>10.1f}ms{new * 1000:>10.1f}ms{old / new:>9.1f}x')
+
+
+if __name__ == '__main__':
+    main()
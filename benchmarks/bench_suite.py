@@ -0,0 +1,273 @@
+# Time and peak memory of every hot path on synthetic exports of growing size.
+#
+#   python benchmarks/bench_suite.py --sizes 5000 500000 --json results.json
+#   python benchmarks/bench_suite.py --sizes 5000 500000 --save-baseline
+#   python benchmarks/bench_suite.py --sizes 5000 500000 --baseline benchmarks/baseline.json
+#
+# Stages: Dashboard.load_data from the CSV and from the on-disk cache, the cube build,
+# each report() KPI, each view's aggregation, its summary string and its Agg render.
+# Memory is the tracemalloc peak of Python allocations plus the peak growth of the process
+# RSS and of pyarrow's allocations, which tracemalloc does not see (the cache load).
+# With --baseline every stage is compared to a stored run and regressions fail the run.
+import argparse
+import json
+import os
+import platform
+import sys
+import threading
+import time
+import tracemalloc
+import types
+
+import matplotlib
+matplotlib.use("Agg")
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+import numpy as np
+import pandas as pd
+import psutil
+import pyarrow as pa
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import sales_views
+from sales_analyze import Dashboard
+from sales_cube import SalesCube
+from sales_data import new_load_stats
+from sales_views import VIEWS
+from synthetic import dataset
+
+SIZES = [5_000, 500_000, 5_000_000, 50_000_000]
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+KPIS = ['Total Revenue', 'Total Profit', 'year', 'month']
+REGION = 'Asia'
+
+# A stage regresses when it is this much slower or bigger than the baseline,
+# and by more than the noise floor
+TOLERANCE = 0.25
+MIN_SECONDS = 0.002
+MIN_MIB = 1.0
+
+# RSS and Arrow allocations are sampled this often while a stage runs
+SAMPLE_SECONDS = 0.001
+
+# Memory metrics of a stage, each compared to the baseline
+MEMORY = ['peak_mib', 'rss_mib', 'arrow_mib']
+
+
+class MemorySampler:
+    # Peak growth of the process RSS and of pyarrow's allocated bytes over a block,
+    # sampled on a background thread
+    def __init__(self):
+        self.process = psutil.Process()
+
+    def __enter__(self):
+        self.rss_start = self.rss_peak = self.process.memory_info().rss
+        self.arrow_start = self.arrow_peak = pa.total_allocated_bytes()
+        self.done = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.done.set()
+        self.thread.join()
+        self.sample()
+
+    def run(self):
+        while not self.done.wait(SAMPLE_SECONDS):
+            self.sample()
+
+    def sample(self):
+        self.rss_peak = max(self.rss_peak, self.process.memory_info().rss)
+        self.arrow_peak = max(self.arrow_peak, pa.total_allocated_bytes())
+
+
+def measure(fn, repeat=1, setup=None):
+    # Best wall time of `repeat` runs, then one more run under tracemalloc and the sampler for the peaks
+    best = float('inf')
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+
+    if setup:
+        setup()
+    tracemalloc.start()
+    with MemorySampler() as memory:
+        fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        'seconds': best,
+        'peak_mib': peak / 2**20,
+        'rss_mib': (memory.rss_peak - memory.rss_start) / 2**20,
+        'arrow_mib': (memory.arrow_peak - memory.arrow_start) / 2**20,
+    }
+
+
+class SummaryTimer:
+    # Wraps the summary string builders to split their share out of a view's compute time
+    BUILDERS = ['create_table_str', 'create_df_str']
+
+    def __init__(self):
+        self.seconds = 0.0
+        self.originals = {name: getattr(sales_views, name) for name in self.BUILDERS}
+
+    def __enter__(self):
+        for name, fn in self.originals.items():
+            setattr(sales_views, name, self.wrap(fn))
+        return self
+
+    def __exit__(self, *exc):
+        for name, fn in self.originals.items():
+            setattr(sales_views, name, fn)
+
+    def wrap(self, fn):
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.seconds += time.perf_counter() - start
+        return timed
+
+
+def render(view, result):
+    fig = Figure(figsize=(10, 6))
+    view.draw(fig.add_subplot(), result)
+    fig.tight_layout()
+    FigureCanvasAgg(fig).draw()
+
+
+def bench_size(rows, repeat, seed):
+    path = dataset(rows, seed)
+    stages = {}
+    app = types.SimpleNamespace(load_stats=new_load_stats(), cube=None)
+
+    def load(use_cache):
+        app.load_stats = new_load_stats()
+        return Dashboard.load_data(app, path, 500_000, use_cache, False)
+
+    # Parsing the CSV also leaves a fresh cache behind for the cached load
+    Dashboard.load_data(app, path, 500_000, True, True)
+    stages['load_data (csv)'] = measure(lambda: load(False))
+    stages['load_data (cache)'] = measure(lambda: load(True), repeat)
+    df = load(True)
+    frame_mib = df.memory_usage(deep=True).sum() / 2**20
+
+    stages['SalesCube'] = measure(lambda: SalesCube(df))
+    app.cube = cube = SalesCube(df)
+    del df
+    clear = cube._rollups.clear
+
+    for key in KPIS:
+        stages[f"report('{key}')"] = measure(lambda: Dashboard.report(app, key), repeat, clear)
+
+    for name, view in VIEWS.items():
+        region = REGION if view.uses_region else None
+        stages[f'compute {name}'] = measure(lambda: view.compute(cube, 'descending', region), repeat, clear)
+
+        # The summary builders only, timed inside one compute call per repeat
+        best = float('inf')
+        for _ in range(repeat):
+            clear()
+            with SummaryTimer() as timer:
+                result = view.compute(cube, 'descending', region)
+            best = min(best, timer.seconds)
+        stages[f'summary {name}'] = {'seconds': best, **dict.fromkeys(MEMORY)}
+
+        stages[f'render {name}'] = measure(lambda: render(view, result), repeat)
+
+    return {'rows': rows, 'frame_mib': frame_mib, 'stages': stages}
+
+
+def compare(current, baseline, tolerance):
+    # Returns (size, stage, metric, baseline, current) for every regressed measurement
+    regressions = []
+    for size, run in current['sizes'].items():
+        base_run = baseline['sizes'].get(size)
+        if base_run is None:
+            continue
+        for stage, values in run['stages'].items():
+            base = base_run['stages'].get(stage)
+            if base is None:
+                continue
+            for metric, floor in [('seconds', MIN_SECONDS)] + [(metric, MIN_MIB) for metric in MEMORY]:
+                now, before = values.get(metric), base.get(metric)
+                if now is None or before is None:
+                    continue
+                if now > before * (1 + tolerance) and now - before > floor:
+                    regressions.append((size, stage, metric, before, now))
+    return regressions
+
+
+def print_run(run, baseline=None):
+    print(f"\n{run['rows']:,} rows, {run['frame_mib']:,.1f} MiB in memory")
+    print(f"{'stage':<34}{'time':>12}{'peak':>14}{'rss':>14}{'arrow':>14}{'vs baseline':>14}")
+    for stage, values in run['stages'].items():
+        memory = ''.join(''.rjust(14) if values.get(metric) is None else f"{values[metric]:>10.1f} MiB"
+                         for metric in MEMORY)
+        change = ''
+        base = (baseline or {}).get(stage)
+        if base and base['seconds']:
+            change = f"{(values['seconds'] / base['seconds'] - 1) * 100:>+12.0f}%"
+        print(f"{stage:<34}{values['seconds'] * 1000:>10.1f}ms{memory}{change:>14}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the dashboard's hot paths on synthetic data")
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES[:2],
+                        help=f"row counts to run (the full suite is {' '.join(map(str, SIZES))})")
+    parser.add_argument('--repeat', type=int, default=3, help="timed runs per stage, the best is kept")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', default=None, help="write the results to this file")
+    parser.add_argument('--baseline', default=None, help="compare against this stored run")
+    parser.add_argument('--save-baseline', action='store_true', help=f"store this run as {BASELINE}")
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE, help="allowed slowdown or growth, 0.25 = 25%%")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    results = {
+        'meta': {
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'matplotlib': matplotlib.__version__,
+            'pyarrow': pa.__version__,
+            'machine': platform.platform(),
+            'cpus': os.cpu_count(),
+            'repeat': args.repeat,
+            'seed': args.seed,
+        },
+        'sizes': {},
+    }
+    for rows in args.sizes:
+        run = bench_size(rows, args.repeat, args.seed)
+        results['sizes'][str(rows)] = run
+        base_stages = baseline['sizes'].get(str(rows), {}).get('stages') if baseline else None
+        print_run(run, base_stages)
+
+    for path in [args.json, BASELINE if args.save_baseline else None]:
+        if path:
+            with open(path, 'w') as f:
+                json.dump(results, f, indent=2)
+            print(f'\nwrote {path}')
+
+    if baseline:
+        regressions = compare(results, baseline, args.tolerance)
+        for size, stage, metric, before, now in regressions:
+            print(f'REGRESSION {int(size):,} rows, {stage}, {metric}: {before:.4g} -> {now:.4g}')
+        if regressions:
+            sys.exit(1)
+        print(f'\nno regressions beyond {args.tolerance:.0%} of the baseline')
+
+
+if __name__ == '__main__':
+    main()
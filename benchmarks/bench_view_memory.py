@@ -0,0 +1,115 @@
+# Peak memory allocated per time-based view, before and after the derived time keys.
+#
+#   python benchmarks/bench_view_memory.py --rows 2000000
+#
+# "before" replays the original copy-based code of report('year'), report('month'),
+# show_sales_over_time and show_sales_by_month, "after" is the current cube path.
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from sales_cube import MONTH_NAMES, SalesCube
+from sales_data import DATA_FILE, add_time_keys, load_sales_csv
+
+
+def legacy_report_year(df):
+    df = df.copy()
+    df['year'] = pd.to_datetime(df['Order Date']).dt.year
+    return df.groupby('year')['Total Revenue'].sum().mean()
+
+
+def legacy_report_month(df):
+    df1 = df.copy()
+    df1['year'] = pd.to_datetime(df1['Order Date']).dt.year
+    df1['month'] = pd.to_datetime(df1['Order Date']).dt.month
+    return df1.groupby(['year', 'month'])['Total Revenue'].sum().mean()
+
+
+def legacy_sales_over_time(df):
+    dfy = df.copy()
+    dfy['year'] = dfy['Order Date'].dt.year
+    return dfy.groupby('year')['Total Revenue'].sum()
+
+
+def legacy_sales_by_month(df):
+    df = df.copy()
+    df['month'] = df['Order Date'].dt.month_name()
+    df['month'] = pd.Categorical(df['month'], categories=MONTH_NAMES, ordered=True)
+    return df.groupby(['Item Type', 'month'], observed=True)['Total Revenue'].mean().unstack()
+
+
+def current_views(cube):
+    return {
+        "report('year')": lambda: cube.sum(['year'], 'Total Revenue').mean(),
+        "report('month')": lambda: cube.sum(['year', 'month'], 'Total Revenue').mean(),
+        'show_sales_over_time': lambda: cube.sum(['year'], 'Total Revenue'),
+        'show_sales_by_month': lambda: cube.mean(['Item Type', 'month'], 'Total Revenue').unstack(),
+    }
+
+
+def measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak, elapsed
+
+
+def synthetic_frame(rows):
+    # Repeat the sample file until it reaches the requested size
+    base = load_sales_csv(DATA_FILE).drop(columns=['year', 'month', 'quarter', 'month ordinal'])
+    reps = int(np.ceil(rows / len(base)))
+    return base.iloc[np.tile(np.arange(len(base)), reps)[:rows]].reset_index(drop=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Peak memory per time-based view")
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    df = synthetic_frame(args.rows)
+    mb = df.memory_usage(deep=True).sum() / 2**20
+    print(f'{len(df):,} rows, {mb:,.1f} MiB in memory\n')
+
+    before = {
+        "report('year')": lambda: legacy_report_year(df),
+        "report('month')": lambda: legacy_report_month(df),
+        'show_sales_over_time': lambda: legacy_sales_over_time(df),
+        'show_sales_by_month': lambda: legacy_sales_by_month(df),
+    }
+    before = {name: measure(fn) for name, fn in before.items()}
+
+    # One-off costs paid at load time by the current path
+    once = {}
+    once['add_time_keys'] = measure(lambda: add_time_keys(df))
+    cube = None
+
+    def build():
+        nonlocal cube
+        cube = SalesCube(df)
+    once['SalesCube'] = measure(build)
+
+    after = {}
+    for name, fn in current_views(cube).items():
+        cube._rollups.clear()
+        after[name] = measure(fn)
+
+    print(f"{'view':<24}{'before peak':>14}{'after peak':>14}{'before':>10}{'after':>10}")
+    for name in before:
+        (bp, bt), (ap, at) = before[name], after[name]
+        print(f'{name:<24}{bp / 2**20:>10.1f} MiB{ap / 2**20:>10.2f} MiB{bt * 1000:>8.1f}ms{at * 1000:>8.2f}ms')
+    print('\nonce per load:')
+    for name, (peak, elapsed) in once.items():
+        print(f'{name:<24}{peak / 2**20:>10.1f} MiB{elapsed * 1000:>10.1f}ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+# Synthetic sales exports with the schema and value spread of the sample CSV.
+#
+#   python benchmarks/synthetic.py --rows 5000000 --out benchmarks/data/sales_5000000.csv
+#
+# Regions and countries, item types with their fixed unit price and cost, channels,
+# priorities, the order date range and the ship delay are all taken from the sample file.
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from sales_data import DATA_FILE, DATE_FORMAT, load_sales_csv
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+SAMPLE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', DATA_FILE)
+
+# Rows generated and written per step, keeps memory flat for the 50M row files
+WRITE_CHUNK = 1_000_000
+
+
+class SalesProfile:
+    # Value distributions of the sample file
+    def __init__(self, path=SAMPLE_FILE):
+        df = load_sales_csv(path)
+        countries = df.groupby(['Region', 'Country'], observed=True).size()
+        self.regions = countries.index.get_level_values('Region').astype(str).to_numpy()
+        self.countries = countries.index.get_level_values('Country').astype(str).to_numpy()
+        self.country_weights = (countries / countries.sum()).to_numpy()
+
+        items = df.groupby('Item Type', observed=True)[['Unit Price', 'Unit Cost']].first()
+        self.items = items.index.astype(str).to_numpy()
+        self.unit_price = items['Unit Price'].to_numpy('float64').round(2)
+        self.unit_cost = items['Unit Cost'].to_numpy('float64').round(2)
+
+        self.channels = np.asarray(df['Sales Channel'].cat.categories, dtype=str)
+        self.priorities = np.asarray(df['Order Priority'].cat.categories, dtype=str)
+        self.first_day = df['Order Date'].min()
+        self.days = (df['Order Date'].max() - self.first_day).days + 1
+        self.max_ship_delay = int((df['Ship Date'] - df['Order Date']).dt.days.max())
+        self.max_units = int(df['Units Sold'].max())
+
+
+def generate(profile: SalesProfile, rows: int, rng: np.random.Generator, first_id: int = 100_000_000) -> pd.DataFrame:
+    country = rng.choice(len(profile.countries), rows, p=profile.country_weights)
+    item = rng.integers(0, len(profile.items), rows)
+    units = rng.integers(1, profile.max_units + 1, rows)
+    order_day = rng.integers(0, profile.days, rows)
+    ship_day = order_day + rng.integers(0, profile.max_ship_delay + 1, rows)
+
+    # Every calendar day is formatted once, rows pick their text by offset
+    calendar = pd.date_range(profile.first_day, periods=profile.days + profile.max_ship_delay)
+    day_text = np.asarray(calendar.strftime(DATE_FORMAT), dtype=object)
+
+    price = profile.unit_price[item]
+    cost = profile.unit_cost[item]
+    revenue = (units * price).round(2)
+    total_cost = (units * cost).round(2)
+    return pd.DataFrame({
+        'Region': profile.regions[country],
+        'Country': profile.countries[country],
+        'Item Type': profile.items[item],
+        'Sales Channel': profile.channels[rng.integers(0, len(profile.channels), rows)],
+        'Order Priority': profile.priorities[rng.integers(0, len(profile.priorities), rows)],
+        'Order Date': day_text[order_day],
+        'Order ID': first_id + rng.permutation(rows),
+        'Ship Date': day_text[ship_day],
+        'Units Sold': units,
+        'Unit Price': price,
+        'Unit Cost': cost,
+        'Total Revenue': revenue,
+        'Total Cost': total_cost,
+        'Total Profit': (revenue - total_cost).round(2),
+    })
+
+
+def write_csv(path: str, rows: int, seed: int = 0, profile: SalesProfile | None = None) -> str:
+    profile = profile or SalesProfile()
+    rng = np.random.default_rng(seed)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    # Written to a temporary name first, an interrupted run never leaves a short file behind
+    tmp = f'{path}.tmp'
+    written = 0
+    with open(tmp, 'w', newline='') as f:
+        while written < rows:
+            n = min(WRITE_CHUNK, rows - written)
+            # Order IDs stay unique across chunks, each chunk gets its own ID block
+            chunk = generate(profile, n, rng, first_id=100_000_000 + written)
+            chunk.to_csv(f, header=written == 0, index=False, float_format='%.2f')
+            written += n
+    os.replace(tmp, path)
+    return path
+
+
+def dataset(rows: int, seed: int = 0, data_dir: str = DATA_DIR) -> str:
+    # Generated once per size and seed, later runs reuse the file
+    path = os.path.join(data_dir, f'sales_{rows}_{seed}.csv')
+    if not os.path.exists(path):
+        print(f'generating {rows:,} rows -> {path}')
+        write_csv(path, rows, seed)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a synthetic sales CSV")
+    parser.add_argument('--rows', type=int, default=500_000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', default=None)
+    args = parser.parse_args()
+
+    path = args.out or os.path.join(DATA_DIR, f'sales_{args.rows}_{args.seed}.csv')
+    write_csv(path, args.rows, args.seed)
+    print(f'wrote {args.rows:,} rows to {path}')
+
+
+if __name__ == '__main__':
+    main()
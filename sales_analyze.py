@@ -1,18 +1,96 @@
+import time
+
+# Startup timings are measured from here, before anything heavy is imported
+STARTED = time.perf_counter()
+
 import tkinter as tk
 from tkinter import ttk
-import pandas as pd
-import matplotlib.pyplot as plt
-import matplotlib.ticker as mtick
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+import argparse
+import os
+import queue
+import threading
+from collections import OrderedDict
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor
+from sales_timing import Interaction, LatencyLog, format_entry, format_startup
+
+# pandas, matplotlib and the sales modules built on them are imported where they are used.
+# The startup thread imports them first, so the window shows before they have loaded.
+
+# How often the Tk loop checks for finished view computations
+POLL_INTERVAL_MS = 30
+
+# Number of computed view results kept for instant repeat navigation
+VIEW_CACHE_SIZE = 64
+
+# Number of cubes of filtered rows kept for switching back and forth between filters
+FILTERED_CUBES = 8
+
+# Zoom and pan settle for this long before the view is queried again
+ZOOM_DELAY_MS = 150
+
+# How often the Tk loop checks for rows ingested from the watched directory
+INGEST_POLL_MS = 1000
+
+# Pointer travel in pixels under which a press and release on a bar count as a click
+CLICK_PIXELS = 4
+
+class ViewCache:
+    # Bounded LRU of view results keyed by (view, region, sort order, data version)
+    def __init__(self, maxsize=VIEW_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        if key in self.entries:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return self.entries[key]
+        self.misses += 1
+        return None
+
+    def put(self, key, result):
+        self.entries[key] = result
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
 
 class Dashboard:
-    def __init__(self, root):
+    def __init__(self, root, data_path=None, chunksize=None, use_cache=True, rebuild_cache=False,
+                 timing_log=None, show_timings=False, backend="pandas", approximate=False,
+                 sample_size=None):
         self.root = root
         self.root.title("Dashboard")
         self.root.geometry("1760x990")
 
-        # Load data
-        self.data = self.load_data()
+        # Data is loaded on the startup thread, these are set once it is done
+        self.data_path = data_path
+        self.engine = self.cube = None
+        self.views = {}
+        self.regions = []
+
+        # Stratified sample answering filtered views first, None unless approximate
+        self.approximate = approximate
+        self.sample_size = sample_size
+        self.sample = None
+        self.pending_preview = None
+
+        # (filters, data version) the header KPIs show exact figures for, and those figures
+        self.header_key = None
+        self.header_kpis = None
+        self.filtered_cubes = OrderedDict()
+        self.cube_lock = threading.Lock()
+
+        # Seconds from launch to each startup milestone
+        self.startup = {}
+        self.loaded = queue.Queue()
+        self.loaded_sizes = {}
+        self.pending_watch = None
 
         # Variable to track sorting order
         self.sort_var = tk.StringVar(value="none")
@@ -23,17 +101,171 @@ class Dashboard:
         # Variable to track selected region
         self.region_var = tk.StringVar(value="Asia")
 
-        # Create main frames
+        # Time grain of Revenue Over Time and the zoomed window of the active chart
+        self.grain_var = tk.StringVar(value="Year")
+        self.zoom_window = None
+        self.zoom_job = None
+        self.drag = None
+        self.click = None
+        self.shown = None
+
+        # Variables for the date range and category filters, "All" means no filter
+        self.date_from_var = tk.StringVar(value="")
+        self.date_to_var = tk.StringVar(value="")
+        self.filter_vars = {}
+        self.filters = None
+
+        # (data, FilterIndex, data version) swapped in as one, so a worker never applies the
+        # row positions of one version to the rows of another. The version is bumped whenever
+        # the data changes and is part of every cached view key
+        self.dataset = (None, None, 0)
+        self.view_cache = ViewCache()
+
+        # Views are computed on a worker pool, results come back through a queue
+        self.executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="view")
+        self.results = queue.Queue()
+        self.request_id = 0
+        self.pending = None
+        self.polling = False
+
+        # Per-stage timings of the interaction being shown, kept as rolling percentiles
+        self.timing = bool(timing_log or show_timings)
+        self.interaction = None
+        self.latency_log = LatencyLog(timing_log)
+        self.status_var = tk.StringVar(value="")
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
+
+        # Create main frames, KPIs, filters and the chart are placeholders until the data is in
         self.create_header()
+        if show_timings:
+            self.create_status_bar()
         self.create_sidebar()
         self.create_main_content()
+        self.highlight_active_button("Revenue by Region")
+
+        # Imports, parsing and the cube run on the startup thread while the Tk loop starts
+        self.root.after(0, self.mark_startup, 'window')
+        threading.Thread(target=self.load_in_background, args=(backend, chunksize, use_cache, rebuild_cache),
+                         daemon=True, name="startup").start()
+        self.root.after(POLL_INTERVAL_MS, self.poll_loaded)
+
+    def mark_startup(self, milestone):
+        self.startup[milestone] = time.perf_counter() - STARTED
 
-        # Initialize with default view
-        self.show_revenue_by_region()
-    def load_data(self):
+    def load_in_background(self, backend, chunksize, use_cache, rebuild_cache):
+        # Runs on the startup thread: heavy imports, data, index, cube and KPIs, no Tk calls
         try:
+            # Imported here so the Tk thread finds them loaded
+            import matplotlib.backends.backend_tkagg
+            import matplotlib.figure
+            from sales_cube import SalesCube
+            from sales_data import DATA_FILE, is_sharded, new_load_stats, shard_paths
+            from sales_index import FILTER_COLS, FilterIndex
+            from sales_views import VIEWS
+            self.mark_startup('imports')
+
+            path = self.data_path or DATA_FILE
+            self.load_stats = new_load_stats()
+            if backend == "pandas":
+                engine = None
+                # Sizes before parsing, a watched directory reads these files on from there
+                paths = shard_paths(path) if is_sharded(path) else [path]
+                self.loaded_sizes = {p: os.path.getsize(p) for p in paths if os.path.exists(p)}
+                data = self.load_data(path, chunksize, use_cache, rebuild_cache)
+                if data is None:
+                    self.loaded.put((False, None))
+                    return
+
+                # Keep rows in date order so date filters are a binary search
+                if not data['Order Date'].is_monotonic_increasing:
+                    data = data.sort_values('Order Date', kind='stable', ignore_index=True)
+                index = FilterIndex(data)
+
+                # Pre-aggregate once, views and KPIs read from the cube
+                cube = SalesCube(data)
+                if self.approximate:
+                    from sales_sample import PER_STRATUM, StratifiedSample
+                    sample = StratifiedSample(data, self.sample_size or PER_STRATUM)
+                    # A sample holding every row would only repeat the exact answer
+                    self.sample = sample if len(sample) < len(data) else None
+            else:
+                from sales_backend import QueryCube, open_engine
+                # Out-of-core: nothing is loaded, every rollup is a query on the file
+                engine = open_engine(backend, path)
+                data = index = None
+                cube = QueryCube(engine)
+                if self.approximate:
+                    print("Error: --approximate needs the pandas backend, the other backends keep no rows to sample")
+            self.mark_startup('data')
+
+            kpis = {report_key: self.report(report_key, cube) for report_key in self.kpi_labels}
+
+            # Filter choices and regions are scans of the files on the out-of-core backends
+            choices = {col: cube.values(col) if engine else index.categories[col] for col in FILTER_COLS}
+            regions = cube.regions()
+            self.loaded.put((True, (engine, data, index, cube, VIEWS, kpis, choices, regions)))
+        except Exception as e:
+            print(f"Error: {e}")
+            self.loaded.put((False, e))
+
+    def poll_loaded(self):
+        try:
+            ok, loaded = self.loaded.get_nowait()
+        except queue.Empty:
+            self.root.after(POLL_INTERVAL_MS, self.poll_loaded)
+            return
+        if not ok:
+            self.placeholder.configure(text="Could not load the sales data" + (f": {loaded}" if loaded else ""))
+            return
+
+        self.engine, data, index, self.cube, self.views, kpis, choices, self.regions = loaded
+        self.dataset = (data, index, 0)
+        self.refresh_header(kpis)
+        self.header_key = (None, 0)
+        self.mark_startup('kpis')
+
+        self.create_filters(choices)
+        self.create_chart()
+        for button in self.buttons.values():
+            button.state(['!disabled'])
+
+        # The default view, with whatever sort order was picked while loading
+        self.update_current_view()
+        if self.pending_watch is not None:
+            self.watch_directory(*self.pending_watch)
+
+    def finish_startup(self):
+        self.mark_startup('view')
+        text = format_startup(self.startup)
+        print(text)
+        self.status_var.set(text)
+
+    def load_data(self, path=None, chunksize=None, use_cache=False, rebuild_cache=False):
+        import pandas as pd
+        from sales_data import (DATA_FILE, add_time_keys, is_sharded, load_sales_cached, load_sales_csv,
+                                load_sales_shards, print_load_stats, shard_paths)
+        path = path or DATA_FILE
+        try:
+            # A directory or glob of CSV shards is parsed on a process pool
+            if is_sharded(path):
+                df = load_sales_shards(shard_paths(path), chunksize or 500_000, self.load_stats, use_cache, rebuild_cache)
+                print_load_stats(self.load_stats)
+                return df
+
+            # Reuse the columnar cache of the cleaned frame unless the CSV changed
+            if use_cache:
+                df = load_sales_cached(path, chunksize or 500_000, self.load_stats, rebuild_cache)
+                print_load_stats(self.load_stats)
+                return df
+
+            # Stream large files in chunks with the explicit schema
+            if chunksize:
+                df = load_sales_csv(path, chunksize, self.load_stats)
+                print_load_stats(self.load_stats)
+                return df
+
             # Load the CSV file
-            df = pd.read_csv("5000 Sales Records.csv")
+            df = pd.read_csv(path)
 
             # Drop missing and duplicate values
             df.dropna(inplace=True)
@@ -60,10 +292,11 @@ class Dashboard:
             # Drop rows with NaN values (which may occur after coercing non-numeric values)
             df.dropna(inplace=True)
 
-            return df
+            # Derive year/month/quarter keys once instead of in every view
+            return add_time_keys(df)
 
         except FileNotFoundError:
-            print("Error: The file '5000 Sales Records.csv' was not found.")
+            print(f"Error: The file '{path}' was not found.")
         except KeyError as e:
             print(f"Error: {e}")
 
@@ -89,37 +322,51 @@ class Dashboard:
         ]
 
 
+        # KPI labels are kept so filters can refresh them, they show a placeholder until the data is in
+        self.kpi_labels = {}
         for index, (title, report_key) in enumerate(box_data):
 
             box = tk.LabelFrame(container_frame, text=title, bg="white")
             box.grid(row=0, column=index+1, padx=10, pady=10, sticky="nsew")
             
-            tk.Label(box, text=self.report(report_key), 
-                    font=("TkDefaultFont", 15, "bold"), bg="white").grid(row=0, column=0, padx=30, pady=10)
+            self.kpi_labels[report_key] = tk.Label(box, text="…", 
+                    font=("TkDefaultFont", 15, "bold"), bg="white")
+            self.kpi_labels[report_key].grid(row=0, column=0, padx=30, pady=10)
 
         # Configure grid columns to resize evenly if window is resized
         for i in range(22):
             container_frame.grid_columnconfigure(i, weight=1)
 
     # gives text data to the text box container_frame
-    def report(self,column):
+    def report(self,column, cube=None):
+        from sales_views import add_BM
+        cube = cube or self.cube
 
         if column=='year':
-            df=self.data.copy()
-            df['year'] = pd.to_datetime(df['Order Date']).dt.year
-            m=df.groupby('year')['Total Revenue'].sum().mean()
-            return self.add_BM(m,2)
+            m=cube.sum(['year'], 'Total Revenue').mean()
+            return add_BM(m,2)
         elif  column == "month":
-            df1=self.data.copy()
-            df1['year'] = pd.to_datetime(df1['Order Date']).dt.year
-            df1['month'] = pd.to_datetime(df1['Order Date']).dt.month
-            m=df1.groupby(['year','month'])['Total Revenue'].sum().mean()
-            return self.add_BM(m,2)
+            m=cube.sum(['year','month'], 'Total Revenue').mean()
+            return add_BM(m,2)
         else:        
-            m=self.data[column].sum()
-            return self.add_BM(m,2)
+            m=cube.total(column)
+            return add_BM(m,2)
+
+    def refresh_header(self, kpis, approximate=False):
+        # KPI texts are computed with the view on a worker, estimates from the sample are
+        # marked until the exact figures replace them
+        for report_key, label in self.kpi_labels.items():
+            label.configure(text=("≈ " if approximate else "") + kpis[report_key])
+        if not approximate:
+            self.header_kpis = kpis
     
 
+    def create_status_bar(self):
+        # Debug line with the stage breakdown of the last interaction
+        status_frame = ttk.Frame(self.root)
+        status_frame.pack(side=tk.BOTTOM, fill=tk.X)
+        ttk.Label(status_frame, textvariable=self.status_var, font=("TkFixedFont", 9)).pack(side=tk.LEFT, padx=10, pady=2)
+
     def create_sidebar(self):
         sidebar_frame = ttk.Frame(self.root, width=200)
         sidebar_frame.pack(side=tk.LEFT, fill=tk.Y)
@@ -135,7 +382,9 @@ class Dashboard:
             "Sales by Month": ttk.Button(sidebar_frame, text="Sales by Month", command=lambda: self.show_sales_by_month())
         }
 
+        # Enabled once the data is loaded
         for button in self.buttons.values():
+            button.state(['disabled'])
             button.pack(pady=5, padx=10, fill=tk.X)
 
         # Radio buttons for sorting
@@ -146,6 +395,29 @@ class Dashboard:
         ttk.Radiobutton(sort_frame, text="Ascending", variable=self.sort_var, value="ascending", command=self.update_current_view).pack(anchor=tk.W)
         ttk.Radiobutton(sort_frame, text="Descending", variable=self.sort_var, value="descending", command=self.update_current_view).pack(anchor=tk.W)
 
+        # Date range and category filters, filled in by create_filters once the data is loaded
+        self.filter_frame = ttk.LabelFrame(sidebar_frame, text="Filters")
+        self.filter_frame.pack(pady=10, padx=10, fill=tk.X)
+
+    def create_filters(self, choices):
+        filter_frame = self.filter_frame
+        self.filter_vars = {col: tk.StringVar(value="All") for col in choices}
+
+        for text, var in [("From (YYYY-MM-DD):", self.date_from_var), ("To (YYYY-MM-DD):", self.date_to_var)]:
+            ttk.Label(filter_frame, text=text).pack(anchor=tk.W)
+            entry = ttk.Entry(filter_frame, textvariable=var)
+            entry.bind("<Return>", self.apply_filters)
+            entry.pack(fill=tk.X)
+
+        for col, var in self.filter_vars.items():
+            ttk.Label(filter_frame, text=f"{col}:").pack(anchor=tk.W)
+            selector = ttk.Combobox(filter_frame, textvariable=var, state="readonly",
+                                    values=["All"] + choices[col])
+            selector.bind("<<ComboboxSelected>>", self.apply_filters)
+            selector.pack(fill=tk.X)
+
+        ttk.Button(filter_frame, text="Apply", command=self.apply_filters).pack(pady=5, fill=tk.X)
+        ttk.Button(filter_frame, text="Reset", command=self.reset_filters).pack(fill=tk.X)
 
     def create_main_content(self):
         self.content_frame = ttk.Frame(self.root)
@@ -160,63 +432,132 @@ class Dashboard:
         self.region_selector = ttk.Combobox(self.selector_frame, textvariable=self.region_var, state="readonly")
         self.region_selector.bind("<<ComboboxSelected>>", self.update_profit_by_country)
 
+        # Create the time grain selector of Revenue Over Time (hidden by default)
+        self.grain_label = ttk.Label(self.selector_frame, text="Granularity:")
+        self.grain_selector = ttk.Combobox(self.selector_frame, textvariable=self.grain_var, state="readonly")
+        self.grain_selector.bind("<<ComboboxSelected>>", self.update_sales_over_time)
+
         # Create a frame for the chart
         self.chart_frame = ttk.Frame(self.content_frame)
         self.chart_frame.pack(side=tk.TOP, expand=True, fill=tk.BOTH)
 
+        # Stands in for the chart until matplotlib and the data are loaded
+        self.placeholder = ttk.Label(self.chart_frame, text="Loading sales data...", font=("Helvetica", 14))
+        self.placeholder.pack(side=tk.TOP, expand=True)
+        self.fig = self.canvas = None
+
+        # Bars and labels of the last bar chart, reused when only the sort order changes
+        self.bar_view = None
+
+        # Loading indicator shown over the chart while a view is computed
+        self.loading_label = ttk.Label(self.content_frame, text="Loading...", font=("Helvetica", 14))
+
+        # Badge over the chart while it shows an estimate from the sample
+        self.preview_label = tk.Label(self.content_frame, text="Preview from a sample, refining...",
+                                      font=("Helvetica", 11, "bold"), fg="white", bg="#d35400", padx=8, pady=2)
+
         # Create a Text widget for the summary report
         self.summary_text = tk.Text(self.content_frame, height=12, wrap=tk.WORD)
         self.summary_text.pack(side=tk.BOTTOM, fill=tk.X, padx=12, pady=6)
 
-    def update_chart(self, fig, summary):
-        plt.close(fig)
-        
-        # Clear existing widgets in the chart_frame
-        for widget in self.chart_frame.winfo_children():
-            widget.destroy()
-
-        # Update the chart
-        canvas = FigureCanvasTkAgg(fig, master=self.chart_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=1)
+    def create_chart(self):
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from matplotlib.figure import Figure
+        from sales_lod import GRAINS
+        self.grain_selector['values'] = [grain.title() for grain in GRAINS] + ["Auto"]
+
+        # One long-lived figure and canvas, views clear and redraw its axes
+        self.placeholder.destroy()
+        self.fig = Figure(figsize=(10, 6))
+        self.canvas = FigureCanvasTkAgg(self.fig, master=self.chart_frame)
+        self.canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=1)
+
+        # Scroll to zoom, drag to pan, double-click to reset the zoomable views
+        self.canvas.mpl_connect('scroll_event', self.on_scroll)
+        self.canvas.mpl_connect('button_press_event', self.on_press)
+        self.canvas.mpl_connect('motion_notify_event', self.on_motion)
+        self.canvas.mpl_connect('button_release_event', self.on_release)
+
+    def new_axes(self):
+        self.fig.clear()
+        self.bar_view = None
+        return self.fig.add_subplot()
+
+    def remember_bars(self, view, ax, data, annotations):
+        self.bar_view = {'view': view, 'ax': ax, 'labels': sorted(map(str, data.index)), 'annotations': annotations}
+
+    def update_bars(self, view, data, dol) -> bool:
+        from sales_views import add_BM
+        # A sort change keeps the same bars in a new order: update heights and labels in place
+        if self.bar_view is None or self.bar_view['view'] != view or self.bar_view['labels'] != sorted(map(str, data.index)):
+            return False
+
+        ax = self.bar_view['ax']
+        for bar, annotation, height in zip(ax.patches, self.bar_view['annotations'], data.values):
+            bar.set_height(height)
+            annotation.set_text(add_BM(height,1,dol))
+            annotation.xy = (bar.get_x() + bar.get_width() / 2, height)
+        ax.set_xticklabels([str(i) for i in data.index])
+
+        # Exact figures replacing a preview may not fit the estimate's y-range
+        ax.relim()
+        ax.autoscale_view(scalex=False)
+        return True
+
+    def draw_view(self, key, result):
+        view = self.views[key[0]]
+
+        # Same bars in a new order only need their heights and labels updated,
+        # the key without its sort order identifies the bars
+        bar_key = key[:4] + key[5:]
+        self.shown = result
+        with self.stage('plot'):
+            updated = view.bar_unit is not None and self.update_bars(bar_key, result['data'], view.bar_unit)
+        if updated:
+            return self.update_chart(result['summary'])
+
+        with self.stage('plot'):
+            ax = self.new_axes()
+            if result['data'].empty:
+                ax.text(0.5, 0.5, "No sales match the selected filters", ha='center', va='center', transform=ax.transAxes)
+            else:
+                annotations = view.draw(ax, result)
+                # Bars with capped or no labels are always redrawn
+                if view.bar_unit is not None and annotations is not None and len(annotations) == len(ax.patches):
+                    self.remember_bars(bar_key, ax, result['data'], annotations)
+        if not result['data'].empty:
+            with self.stage('tight_layout'):
+                self.fig.tight_layout()
+        self.update_chart(result['summary'])
+
+    def update_chart(self, summary):
+        first = 'view' not in self.startup
+        if self.interaction is None and not first:
+            # Redraw on the next idle cycle instead of rebuilding the canvas widget
+            self.canvas.draw_idle()
+        else:
+            # Drawn right away while timing or starting up, so the cost lands in the measurement
+            with self.stage('draw'):
+                self.canvas.draw()
 
         # Update the summary report
-        self.summary_text.delete(1.0, tk.END)
-        self.summary_text.insert(tk.END, summary)
+        with self.stage('widgets'):
+            self.summary_text.delete(1.0, tk.END)
+            self.summary_text.insert(tk.END, summary)
+        self.finish_interaction()
+        if first:
+            self.finish_startup()
+
+    def stage(self, name):
+        return self.interaction.stage(name) if self.interaction else nullcontext()
+
+    def finish_interaction(self):
+        if self.interaction is None:
+            return
+        entry = self.latency_log.record(self.interaction)
+        self.interaction = None
+        self.status_var.set(format_entry(entry))
 
-    def add_BM(self,height,till=0,dol='$') -> str:
-        if height >= 1_000_000_000:
-            label = f'{dol}{height // 1_000_000_000:.0f},{(height/10_000_000):.{till}f}M'
-        elif height>=1_000_000:
-            label = f'{dol}{height / 1_000_000:.{till}f}M'
-        else:
-            label= f'{dol}{height / 1_000_000:.1f}M' if height!=0 else f'{dol}{0}'
-        return label
-
-    def annotate_bars(self, ax,dol='$'):
-        for bar in ax.patches:
-            height = bar.get_height()
-            label=self.add_BM(height,1,dol) # add $ and M 
-            ax.annotate(label, 
-                        xy=(bar.get_x() + bar.get_width() / 2, bar.get_height()), 
-                        xytext=(0, 0), 
-                        textcoords="offset points", 
-                        ha='center', 
-                        va='bottom')
-        plt.tight_layout()
-
-    def apply_sorting(self, data, q='')-> pd.Series:
-        if self.sort_var.get() == "ascending":
-            return data.sort_values(ascending=True)
-        elif self.sort_var.get() == "descending":
-            return data.sort_values(ascending=False)
-        return data
-    def sort_with_col(self,data_col,col) -> pd.DataFrame:
-        if self.sort_var.get() == "ascending":
-            return data_col.sort_values(by=col,ascending=True)
-        elif self.sort_var.get() == "descending":
-            return data_col.sort_values(by=col,ascending=False)
-        return data_col
     def highlight_active_button(self, active_button_text):
         # Reset all buttons to default style
         for button in self.buttons.values():
@@ -228,8 +569,8 @@ class Dashboard:
 
         self.active_button = active_button_text
 
-        # Show or hide the region selector based on the active button
-        if active_button_text == "Profit by Country":
+        # Show or hide the region and grain selectors based on the active button
+        if active_button_text in ("Profit by Country", "Revenue Over Time"):
             self.selector_frame.pack(side=tk.TOP, fill=tk.X, padx=10, pady=10)
         else:
             self.selector_frame.pack_forget()   
@@ -247,70 +588,403 @@ class Dashboard:
         elif self.active_button=='Sales by Month':
             self.show_sales_by_month()
 
-    def create_table_str(self,table_name: str, series: pd.Series, col1_name: str, col2_name: str, col_width: int) -> str:
-        # Table title with formatting
-        table_title = f'{table_name}' 
-        # Create the header row with custom column names
-        header = f'| {col1_name:<{col_width}}|  {col2_name:<{col_width}}|'
-        separator = '+'+'-' * (len(header)-2)+'+'
-        rows = [table_title,separator , header, separator]
-
-        for i, value in series.items():
-            row = f'| {i:<{col_width}}|  {value:<{col_width}}|'
-            rows.append(row)
+    def request_view(self, name, keep_zoom=False):
+        # Nothing to show before the data is loaded, the startup thread requests the view then
+        if self.cube is None:
+            return
+
+        # Snapshot the Tk variables here, worker threads must not touch Tk
+        sort, region = self.sort_var.get(), self.region_var.get()
+        view = self.views[name]
+
+        # Anything but zooming and panning shows the whole range again
+        if not keep_zoom:
+            self.zoom_window = None
+        detail = None
+        if view.zoom is not None:
+            detail = (self.grain_var.get().lower(), self.zoom_window) if view.uses_grain else self.zoom_window
+
+        # Only the latest request is drawn, cancel the previous one if it hasn't started
+        for pending in (self.pending, self.pending_preview):
+            if pending is not None:
+                pending.cancel()
+        self.pending = self.pending_preview = None
+        self.request_id += 1
+        self.interaction = Interaction(name) if self.timing else None
+
+        # Repeat navigation is answered from the result cache without a worker round trip
+        key = (name, region if view.uses_region else None, self.filters, self.dataset[2], sort, detail)
+        result = self.view_cache.get(key)
+        if result is not None:
+            if self.interaction:
+                self.interaction.cached = True
+            self.loading_label.place_forget()
+            self.show_result(key, result)
+            return
+
+        # A filter set without a cube yet is the slow path: the sample answers first,
+        # the exact result replaces the preview when it arrives
+        if self.sample is not None and key[2] is not None and key[2:4] not in self.filtered_cubes:
+            self.pending_preview = self.executor.submit(self.run_view, self.request_id, key, view.compute, sort,
+                                                        region, time.perf_counter(), True)
+        self.pending = self.executor.submit(self.run_view, self.request_id, key, view.compute, sort, region,
+                                            time.perf_counter())
+
+        self.loading_label.place(in_=self.chart_frame, relx=0.5, rely=0.5, anchor=tk.CENTER)
+        self.loading_label.lift()
+        if not self.polling:
+            self.polling = True
+            self.root.after(POLL_INTERVAL_MS, self.poll_results)
+
+    def run_view(self, request_id, key, compute, sort, region, submitted, preview=False):
+        # Runs on a worker thread: aggregation and summary text only, no Tk or pyplot calls
+        start = time.perf_counter()
+        timings = {'queue': start - submitted}
+        try:
+            cube = self.sample.cube(key[2]) if preview else self.cube_for(key[2])
+            filtered = time.perf_counter()
+            result = compute(cube, sort, region) if key[5] is None else compute(cube, sort, region, key[5])
+            # The header KPIs of the same rows, so the Tk thread never aggregates
+            result = dict(result, kpis={report_key: self.report(report_key, cube) for report_key in self.kpi_labels})
+            timings['filter'] = filtered - start
+            timings['aggregate'] = time.perf_counter() - filtered
+            self.results.put((preview, request_id, key, True, result, timings))
+        except Exception as e:
+            self.results.put((preview, request_id, key, False, e, timings))
+
+    def poll_results(self):
+        items = []
+        while True:
+            try:
+                items.append(self.results.get_nowait())
+            except queue.Empty:
+                break
+
+        # Exact results first, a preview arriving with the exact result is never drawn
+        for preview, request_id, key, ok, result, timings in sorted(items, key=lambda item: item[0]):
+            if preview:
+                if ok and request_id == self.request_id and self.pending is not None:
+                    self.show_preview(key, result, timings)
+                continue
+
+            # Superseded results are still worth caching, but only the latest is drawn
+            if ok and key[3] == self.dataset[2]:
+                self.view_cache.put(key, result)
+            if request_id != self.request_id:
+                continue
+            self.pending = None
+            with self.stage('widgets'):
+                self.loading_label.place_forget()
+            if self.interaction:
+                for stage, seconds in timings.items():
+                    self.interaction.add(stage, seconds)
+            if not ok:
+                print(f"Error: {result}")
+                self.interaction = None
+                self.show_error(result)
+            else:
+                self.show_result(key, result)
+
+        if self.pending is not None:
+            self.root.after(POLL_INTERVAL_MS, self.poll_results)
+        else:
+            self.polling = False
+
+    def show_result(self, key, result):
+        # The header follows the filters and data of the exact result on screen
+        if key[2:4] != self.header_key:
+            self.refresh_header(result['kpis'])
+            self.header_key = key[2:4]
+        self.preview_label.place_forget()
+        self.draw_view(key, result)
+
+    def show_error(self, error):
+        # No estimate may stay on screen once its badge is gone: the chart and summary say
+        # the view failed, the header goes back to the exact figures it showed before
+        self.preview_label.place_forget()
+        if self.header_kpis is not None:
+            self.refresh_header(self.header_kpis)
+        self.shown = None
+        ax = self.new_axes()
+        ax.text(0.5, 0.5, "Could not compute this view", ha='center', va='center', transform=ax.transAxes)
+        self.canvas.draw_idle()
+        self.summary_text.delete(1.0, tk.END)
+        self.summary_text.insert(tk.END, f"Error: {error}")
+
+    def show_preview(self, key, result, timings):
+        # Drawn while the exact result is computed. The interaction is recorded once up to
+        # the preview and once more up to the exact result
+        if result['data'].empty:
+            # Too few sampled rows pass the filters to say anything, wait for the exact result
+            return
+        exact = self.interaction
+        if exact is not None:
+            self.interaction = Interaction(exact.name)
+            self.interaction.start, self.interaction.rss_start, self.interaction.preview = exact.start, exact.rss_start, True
+            for stage, seconds in timings.items():
+                self.interaction.add(stage, seconds)
+
+        if key[2:4] != self.header_key:
+            self.refresh_header(result['kpis'], approximate=True)
+        note = (f"Preview estimated from {len(self.sample):,} of {self.sample.total_rows():,} rows, "
+                f"sampled per Region and Item Type. The exact figures replace it when ready.\n\n")
+        with self.stage('widgets'):
+            self.loading_label.place_forget()
+            self.preview_label.place(in_=self.chart_frame, relx=1.0, rely=0.0, x=-10, y=10, anchor=tk.NE)
+            self.preview_label.lift()
+        self.draw_view(key, dict(result, summary=note + result['summary']))
+        self.interaction = exact
+
+    def cube_for(self, filters):
+        # Cube of the rows passing the filters, built from the index and kept for reuse
+        if filters is None:
+            return self.cube
+
+        # Read once, the Tk thread may swap in ingested rows while the cube is built
+        data, index, version = self.dataset
+        key = (filters, version)
+        with self.cube_lock:
+            if key in self.filtered_cubes:
+                self.filtered_cubes.move_to_end(key)
+                return self.filtered_cubes[key]
+
+        if self.engine:
+            from sales_backend import QueryCube
+            cube = QueryCube(self.engine, filters)
+        else:
+            from sales_cube import SalesCube
+            start, end, categories = filters
+            rows = index.select(start, end, dict(categories))
+            cube = SalesCube(data.iloc[rows])
+
+        with self.cube_lock:
+            # A cube of rows replaced since then only answers the request that built it
+            if version == self.dataset[2]:
+                self.filtered_cubes[key] = cube
+                while len(self.filtered_cubes) > FILTERED_CUBES:
+                    self.filtered_cubes.popitem(last=False)
+        return cube
+
+    def apply_filters(self, event=None):
+        import pandas as pd
+        try:
+            start = pd.Timestamp(self.date_from_var.get()) if self.date_from_var.get().strip() else None
+            end = pd.Timestamp(self.date_to_var.get()) if self.date_to_var.get().strip() else None
+        except ValueError as e:
+            print(f"Error: invalid date, {e}")
+            return
+
+        categories = tuple((col, (var.get(),)) for col, var in self.filter_vars.items() if var.get() != "All")
+        filters = (start, end, categories) if start or end or categories else None
+        if filters != self.filters:
+            self.filters = filters
+            # The header is refreshed along with the view, from the worker's result
+            self.update_current_view()
+
+    def reset_filters(self):
+        self.date_from_var.set("")
+        self.date_to_var.set("")
+        for var in self.filter_vars.values():
+            var.set("All")
+        self.apply_filters()
+
+    def watch_directory(self, directory, interval):
+        from sales_data import SalesFileWatcher
+        # Started once the data is loaded, the watcher dedups against it
+        if self.cube is None:
+            self.pending_watch = (directory, interval)
+            return
+        if self.engine:
+            print("Error: --watch needs the pandas backend, the other backends read the files in place")
+            return
+        # New and appended CSVs are parsed on a background thread, the Tk loop only swaps them in
+        self.watcher = SalesFileWatcher(directory)
+        # Files that were loaded are only read from where the load started
+        for path, size in self.loaded_sizes.items():
+            self.watcher.start_at(path, size)
+        self.ingested = queue.Queue()
+        data, index, _ = self.dataset
+        threading.Thread(target=self.watch_loop, args=(interval, data, index, self.cube, self.sample),
+                         daemon=True, name="watch").start()
+        self.root.after(INGEST_POLL_MS, self.poll_ingested)
+
+    def watch_loop(self, interval, data, index, cube, sample):
+        from sales_data import new_load_stats
+        # Every Order ID already loaded counts as seen, later files only add what is new
+        self.watcher.seen_ids.add(data['Order ID'].to_numpy())
+        while True:
+            try:
+                stats = new_load_stats()
+                new = self.watcher.poll(stats)
+                if new is not None and len(new):
+                    # Each batch grows the previous one, whether or not the Tk loop swapped it in yet
+                    data, index, cube, sample = self.append_rows(data, index, cube, sample, new)
+                    self.ingested.put((data, index, cube, sample, len(new), stats))
+
+                # Only now are the batch's bytes and Order IDs taken as read
+                self.watcher.commit()
+            except Exception as e:
+                print(f"Error: {e}")
+            time.sleep(interval)
+
+    def append_rows(self, data, index, cube, sample, new):
+        # Runs on the watcher thread: builds the grown frame, index and cube while the
+        # dashboard keeps reading the current ones. The cube, the sample and the index
+        # only merge the new rows
+        import pandas as pd
+        from sales_data import CATEGORY_COLS, concat_chunks
+        from sales_index import FilterIndex
+        new = new[data.columns].sort_values('Order Date', kind='stable', ignore_index=True)
+        newer = data.empty or new['Order Date'].iloc[0] >= data['Order Date'].iloc[-1]
+        if all(isinstance(data[col].dtype, pd.CategoricalDtype) for col in CATEGORY_COLS):
+            data = concat_chunks([data, new])
+        else:
+            data = pd.concat([data, new], ignore_index=True)
+        sample = sample.merge(new) if sample is not None else None
 
-        return '\n'.join(rows)+'\n'+ separator
-    def create_df_str(self,table_name: str, dataframe: pd.DataFrame, col1_name: str, all_column_names: list[str], col_width: int) -> str:
+        # Rows newer than the last date go at the end and keep the frame in date order,
+        # only a batch reaching back into the history re-sorts and re-indexes every row
+        if newer:
+            index = index.append(new)
+        else:
+            data = data.sort_values('Order Date', kind='stable', ignore_index=True)
+            index = FilterIndex(data)
+        return data, index, cube.merge(new), sample
 
-        table_title = f'{table_name}'
+    def poll_ingested(self):
+        try:
+            while True:
+                data, index, cube, sample, rows, stats = self.ingested.get_nowait()
+                # Results of the old data can never be requested again
+                with self.cube_lock:
+                    self.dataset = (data, index, self.dataset[2] + 1)
+                    self.filtered_cubes.clear()
+                self.cube, self.sample = cube, sample
+                self.regions = cube.regions()
+                self.view_cache.clear()
+                print(f"Ingested {rows} new rows ({stats['duplicates']} duplicates skipped), {len(data)} rows in total")
+                self.update_current_view()
+        except queue.Empty:
+            pass
+        self.root.after(INGEST_POLL_MS, self.poll_ingested)
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.root.destroy()
+
+    def zoomable_view(self, event):
+        view = self.views.get(self.active_button)
+        if view is None or view.zoom is None or self.shown is None or event.inaxes is None:
+            return None
+        return view
+
+    def on_scroll(self, event):
+        view = self.zoomable_view(event)
+        if view is None or event.xdata is None:
+            return
+        # Zoom around the pointer, scrolling up zooms in
+        x0, x1 = event.inaxes.get_xlim()
+        scale = 0.7 if event.button == 'up' else 1 / 0.7
+        x0, x1 = event.xdata - (event.xdata - x0) * scale, event.xdata + (x1 - event.xdata) * scale
+
+        # The axes follow right away so quick scrolls add up before the query runs
+        event.inaxes.set_xlim(x0, x1)
+        self.canvas.draw_idle()
+        self.zoom_to(view, x0, x1)
+
+    def on_press(self, event):
+        # Any left click on a chart may be a click on a bar, decided on release
+        self.click = (event.x, event.y) if event.button == 1 and event.inaxes and not event.dblclick else None
+        view = self.zoomable_view(event)
+        if view is None or event.button != 1:
+            return
+        if event.dblclick:
+            self.drag = None
+            if view.uses_grain and self.grain_var.get() == "Auto":
+                self.grain_var.set("Year")
+            self.request_view(self.active_button)
+            return
+        self.drag = (event.x, event.inaxes, event.inaxes.get_xlim())
+
+    def on_motion(self, event):
+        # Panning only moves the axes, the data is queried again on release
+        if self.drag is None or event.x is None:
+            return
+        x, ax, (x0, x1) = self.drag
+        dx = (x - event.x) * (x1 - x0) / ax.bbox.width
+        ax.set_xlim(x0 + dx, x1 + dx)
+        self.canvas.draw_idle()
+
+    def on_release(self, event):
+        click, self.click = self.click, None
+        if self.drag is not None:
+            _, ax, start = self.drag
+            self.drag = None
+            view = self.views.get(self.active_button)
+            if view is not None and ax.get_xlim() != start:
+                self.zoom_to(view, *ax.get_xlim())
+                return
+        if click is not None and event.x is not None and abs(event.x - click[0]) + abs(event.y - click[1]) < CLICK_PIXELS:
+            self.drill_down(event)
+
+    def drill_down(self, event):
+        # A click on a bar opens a grid of the filtered orders behind it
+        view = self.views.get(self.active_button)
+        if view is None or view.drill is None or self.shown is None or event.inaxes is None:
+            return
+        ax = event.inaxes
+        bars = [position for position, bar in enumerate(ax.patches) if bar.contains(event)[0]]
+        labels = ax.get_xticklabels()
+        if not bars or bars[0] >= len(labels):
+            return
+        if self.engine:
+            print("Error: drilling down needs the pandas backend, the other backends keep no rows in memory")
+            return
+
+        from sales_grid import DrillRows, OrderGrid
+        from sales_views import ALL_REGIONS
+        value = labels[bars[0]].get_text()
+        title = f"{view.drill}: {value}"
+
+        # The bar's category is one row array of the index, the filters narrow it like a view's
+        start, end, categories = self.filters or (None, None, ())
+        selected = dict(categories)
+        selected[view.drill] = (value,)
+
+        # Profit by Country only counts the orders of the selected region
+        region = self.shown.get('region')
+        if view.uses_region and region not in (None, ALL_REGIONS):
+            selected['Region'] = (region,)
+            title += f" in {region}"
+        data, index, _ = self.dataset
+        rows = index.select(start, end, selected)
+        OrderGrid(self.root, title, DrillRows(data, rows), self.executor)
+
+    def zoom_to(self, view, x0, x1):
+        self.zoom_window = view.zoom(self.shown, x0, x1)
+        # A zoomed yearly chart switches to the grain that fits the window
+        if view.uses_grain and self.grain_var.get() == "Year":
+            self.grain_var.set("Auto")
+        if self.zoom_job is not None:
+            self.root.after_cancel(self.zoom_job)
+        self.zoom_job = self.root.after(ZOOM_DELAY_MS, self.apply_zoom)
+
+    def apply_zoom(self):
+        self.zoom_job = None
+        self.request_view(self.active_button, keep_zoom=True)
 
-        header = f'| {col1_name:<{col_width}}|  '  
-        for col in all_column_names:
-            header += f'{col:<{col_width}}|  '
-        
-   
-        separator = '+'+'-' * (len(header)-4)+'+'
-        
-    
-        rows = [table_title,separator, header, separator]
-        
-        # Loop through the DataFrame and format each index and row
-        for i, row in dataframe.iterrows():
-            row_str = f'| {i:<{col_width}}|  '  # Add index
-            for col in all_column_names:
-                row_str += f'{str(row[col]):<{col_width}}|  '  # Add each column value
-            rows.append(row_str)
-        
-        # Join all rows into a single string with line breaks
-        return '\n'.join(rows)+'\n'+separator
     def show_revenue_by_region(self):
-        data_grouped = self.data.groupby('Region')['Total Revenue'].sum()
-        data_grouped = self.apply_sorting(data_grouped)
-
-        fig, ax = plt.subplots(figsize=(10, 6))
-
-        data_grouped.plot(kind='bar', ax=ax)
-        
-        # Set title and labels
-        ax.set_title('Revenue by Region')
-        ax.set_ylabel('Total Revenue')
-        plt.xticks(rotation=25, ha='right')
-        # Format the y-axis to display revenue in $100.0M
-        ax.yaxis.set_major_formatter(mtick.FuncFormatter(lambda x, _: self.add_BM(x) ))
-
-        # Annotate bars
-        self.annotate_bars(ax)
-        plt.tight_layout()
-        summary = self.create_table_str("Revenue by Region:",data_grouped.apply(lambda x: self.add_BM(x,2) ),'Region','Total Revenue',35)
-        self.update_chart(fig, summary)
+        self.request_view("Revenue by Region")
         self.highlight_active_button("Revenue by Region")
 
     def show_profit_by_country(self):
-        # Get unique regions and update the region selector
-        regions = sorted(self.data['Region'].unique())
-        self.region_selector['values'] = regions
+        from sales_views import ALL_REGIONS
+        # Regions were listed on the startup thread, update the region selector
+        self.region_selector['values'] = self.regions + [ALL_REGIONS]
         
         # Show the region selector
+        self.grain_label.pack_forget()
+        self.grain_selector.pack_forget()
         self.region_label.pack(side=tk.LEFT, padx=5)
         self.region_selector.pack(side=tk.LEFT, padx=5)
 
@@ -318,173 +992,64 @@ class Dashboard:
 
         self.highlight_active_button("Profit by Country")
     def update_profit_by_country(self, event=None):
-        selected_region = self.region_var.get()
-        
-        # Filter data for the selected region
-        region_data = self.data[self.data['Region'] == selected_region]
-        
-        data_grouped = region_data.groupby('Country')['Total Profit'].sum()
-        data_grouped = self.apply_sorting(data_grouped)
-
-        half_count = len(data_grouped) // 2
-        data_grouped = data_grouped.head(half_count)
-
-        fig, ax = plt.subplots(figsize=(10, 6))
-        data_grouped.plot(kind='bar', ax=ax)
-
-        # Set title and labels
-        ax.set_title(f'Profit by Country in {selected_region}')
-        ax.set_ylabel('Total Profit')
-
-        # Format the y-axis to display profit in $100.0M
-        ax.yaxis.set_major_formatter(mtick.FuncFormatter(lambda x, _: self.add_BM(x)))
-        # Annotate bars
-        self.annotate_bars(ax)
-
-        plt.tight_layout()
-        def var_name()-> pd.Series:
-            if self.sort_var.get() == "ascending":
-                return 'Bottom '
-            elif self.sort_var.get() == "descending":
-                return 'Top '
-            return ""
-            
-        summary = self.create_table_str(f"{var_name()}countries by profit in {selected_region}:", data_grouped.apply(lambda x: self.add_BM(x,2)), 'Country', 'Total Profit', 25)
-        self.update_chart(fig, summary)
+        self.request_view("Profit by Country")
+
     def show_sales_by_item(self):
-        data_grouped = self.data.groupby('Item Type')['Units Sold'].sum()
-        data_grouped = self.apply_sorting(data_grouped)
-
-        fig, ax = plt.subplots(figsize=(10, 6))
-        data_grouped.plot(kind='bar', ax=ax)
-
-        # Set title and labels
-        ax.set_title('Sales by Item')
-        ax.set_ylabel('Units Sold')
-        plt.xticks(rotation=25, ha='right')
-        # Annotate bars
-        ax.yaxis.set_major_formatter(mtick.FuncFormatter(lambda x, _: self.add_BM(x,1,"") ))
-
-        self.annotate_bars(ax,"")
-
-        plt.tight_layout()
-        mk=self.data.groupby('Item Type').agg({
-            'Units Sold': 'sum',
-            'Unit Price': 'mean',
-            'Unit Cost': 'mean',
-            'Total Profit': 'sum'
-        })
-  
-        mk=self.sort_with_col(mk,'Total Profit')
-        mk['Total Profit']=mk['Total Profit'].apply(lambda x: self.add_BM(x,2))
-        mk['Unit Price']=mk['Unit Price'].apply(lambda x: f'${x:.0f}')
-        mk['Unit Cost']=mk['Unit Cost'].apply(lambda x: f'${x:.0f}')
-        mk['Units Sold']=mk['Units Sold'].apply(lambda x: self.add_BM(x,2,""))
-       
-        summary=self.create_df_str("Sales by Item Type:",mk,'Item Type',mk.columns,15)
-        self.update_chart(fig, summary)
+        self.request_view("Sales by Item")
         self.highlight_active_button("Sales by Item")
 
     def show_sales_over_time(self):
-        dfy = self.data.copy()
-        dfy['year'] = dfy['Order Date'].dt.year
-        data_grouped = dfy.groupby('year')['Total Revenue'].sum()
-
-        fig, ax = plt.subplots(figsize=(10, 6))
-        data_grouped.plot(kind='line', ax=ax)
-        ax.plot(data_grouped.index, data_grouped.values, 'o', color='darkblue', markersize=8)
-        # Set title and labels
-        ax.set_title('Total Revenue Over Time')
-        ax.set_ylabel('Total Revenue')
-        ax.set_xlabel('Year')
-
-        # Format the y-axis to display revenue in $100.0M
-        ax.yaxis.set_major_formatter(mtick.FuncFormatter(lambda x, _: self.add_BM(x)))
-        for year, revenue in data_grouped.items():
-            ax.annotate(self.add_BM(revenue, 1), 
-                        xy=(year, revenue), 
-                        xytext=(0, 5),  # Offset the text slightly above the point
-                        textcoords='offset points', 
-                        ha='center', 
-                        va='bottom')
-        plt.tight_layout()
-        data_grouped = self.apply_sorting(data_grouped)
-        summary = self.create_table_str("Total Revenue Over Time:",data_grouped.apply(lambda x: self.add_BM(x,2) ),'year','Total Revenue',15)
-        self.update_chart(fig, summary)
-        self.highlight_active_button("Revenue Over Time")
+        # Show the grain selector
+        self.region_label.pack_forget()
+        self.region_selector.pack_forget()
+        self.grain_label.pack(side=tk.LEFT, padx=5)
+        self.grain_selector.pack(side=tk.LEFT, padx=5)
 
-    def show_sales_by_channel(self):
-        data_grouped = self.data.groupby('Sales Channel')['Total Revenue'].sum()
-        data_grouped = self.apply_sorting(data_grouped)
+        self.update_sales_over_time()
+        self.highlight_active_button("Revenue Over Time")
 
-        fig, ax = plt.subplots(figsize=(10, 6))
-        data_grouped.plot(kind='pie', autopct='%1.1f%%', ax=ax)
-        ax.set_title('Revenue by Channel')
-        plt.tight_layout()
+    def update_sales_over_time(self, event=None):
+        # A new grain keeps the zoomed window
+        self.request_view("Revenue Over Time", keep_zoom=event is not None)
 
-        summary = self.create_table_str("Sales by Channel:",data_grouped.apply(lambda x: self.add_BM(x,2) ),'Sales Channel','Total Revenue',20)
-        self.update_chart(fig, summary)
+    def show_sales_by_channel(self):
+        self.request_view("Sales by Channel")
         self.highlight_active_button("Sales by Channel")
-    def show_sales_by_month(self):
-        df = self.data.copy()
-
-        # Define month order
-        month_order = ['January', 'February', 'March', 'April', 'May', 'June', 
-                    'July', 'August', 'September', 'October', 'November', 'December']
-
-        # Extract the month name from 'Order Date'
-        df['month'] = df['Order Date'].dt.month_name()
-
-        # Convert the 'month' column to a categorical type with the correct order
-        df['month'] = pd.Categorical(df['month'], categories=month_order, ordered=True)
-
-        # Group by 'Item Type' and 'month', summing the 'Total Revenue' with observed=True to avoid the FutureWarning
-        sales_per_year = df.groupby(['Item Type', 'month'], observed=True)['Total Revenue'].mean().unstack()
-
-        fig, ax = plt.subplots(figsize=(8, 6))
 
-        # Plot each item's revenue across months
-        for item_type in sales_per_year.index:
-            ax.plot(month_order, sales_per_year.loc[item_type], marker='o', label=item_type, linewidth=2, markersize=6)
-
-        # Add title and labels
-        ax.set_title('Average Revenue by Item Type and Month')
-        ax.set_xlabel('Month', )
-        ax.set_ylabel('Total Revenue', fontsize=12)
-        # Customize tick parameters for better visibility
-        ax.yaxis.set_major_formatter(mtick.FuncFormatter(lambda x, _: self.add_BM(x,1)))
-        # ax.tick_params(axis='x', rotation=45, labelsize=10)
-        # ax.tick_params(axis='y', labelsize=10)
-
-        # Add legend for item types
-        ax.legend(title='Item Type',  fontsize='10', loc='upper left', bbox_to_anchor=(1, 1))
-
-        # Improve the grid visibility
-        ax.grid(True, linestyle='--', alpha=0.6)
-
-        # Adjust layout to ensure everything fits well
-        plt.tight_layout()
-        
-        if self.sort_var.get() == "ascending":
-            sales_per_year.sort_index(inplace=True)
-        elif self.sort_var.get() == "descending":
-            sales_per_year.sort_index(ascending=False,inplace=True)
-        
-        for i in sales_per_year.columns:
-            sales_per_year[i]=sales_per_year[i].apply(lambda x: self.add_BM(x,2))
-        # Generate the summary table
-        summary = self.create_df_str("Total Revenue by Month:", sales_per_year, 'Month', sales_per_year.columns, 12)
-        # summary=sales_per_year.to_string()
-        # Update the chart in the UI
-        self.update_chart(fig, summary)
+    def show_sales_by_month(self):
+        self.request_view("Sales by Month")
 
         # Highlight active button
         self.highlight_active_button("Sales by Month")
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sales Data Dashboard")
+    parser.add_argument("--data", default=None,
+                        help="sales CSV to load, or a directory or glob of CSV shards (default: the 5000 record sample)")
+    parser.add_argument("--chunksize", type=int, default=None,
+                        help="stream the CSV in chunks of this many rows (for large exports)")
+    parser.add_argument("--no-cache", action="store_true", help="always parse the CSV, skip the on-disk cache")
+    parser.add_argument("--rebuild-cache", action="store_true", help="re-parse the CSV and rewrite the on-disk cache")
+    parser.add_argument("--watch", metavar="DIR", help="ingest new and appended sales CSVs dropped into this directory")
+    # sales_backend.BACKENDS, spelled out so parsing arguments does not import pandas
+    parser.add_argument("--backend", choices=["pandas", "arrow", "duckdb"], default="pandas",
+                        help="pandas loads the data into memory, arrow and duckdb query Parquet/Feather/CSV files out-of-core")
+    parser.add_argument("--timings", action="store_true", help="show the stage timings of each interaction in a status bar")
+    parser.add_argument("--timing-log", metavar="FILE", help="append per-interaction stage timings and rolling percentiles as JSON lines")
+    parser.add_argument("--watch-interval", type=float, default=60, help="seconds between scans of the watched directory")
+    parser.add_argument("--approximate", action="store_true",
+                        help="answer filtered views from a stratified sample first, then replace them with the exact figures")
+    parser.add_argument("--sample-size", type=int, default=None,
+                        help="sampled rows kept per Region and Item Type for --approximate (default 2000)")
+    args = parser.parse_args()
+
     root = tk.Tk()
     style = ttk.Style()
     style.configure('Accent.TButton', background='green')
-    app = Dashboard(root)
+    # Shows the window right away, loading errors are reported in place of the chart
+    app = Dashboard(root, args.data, args.chunksize, not args.no_cache, args.rebuild_cache,
+                    args.timing_log, args.timings, args.backend, args.approximate, args.sample_size)
+    if args.watch:
+        app.watch_directory(args.watch, args.watch_interval)
     root.mainloop()
\ No newline at end of file
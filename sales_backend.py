@@ -0,0 +1,220 @@
+import os
+
+import pandas as pd
+
+from sales_cube import MEASURES
+from sales_data import CATEGORY_COLS, DATE_COLS, DATE_FORMAT
+
+# Data backends behind the views and KPIs. "pandas" loads the whole file and answers from
+# an in-memory SalesCube, the others query Parquet, Feather or CSV files out-of-core and
+# only read the columns and rows a rollup needs.
+BACKENDS = ['pandas', 'arrow', 'duckdb']
+
+# Time keys derived from 'Order Date' when the file does not store them
+TIME_KEYS = ['year', 'month', 'quarter']
+
+
+def source_format(path: str) -> str:
+    if os.path.isdir(path):
+        # A directory of Parquet files, optionally hive-partitioned (e.g. year=2016/)
+        return 'parquet'
+    ext = os.path.splitext(path)[1].lower()
+    if ext in ('.parquet', '.pq'):
+        return 'parquet'
+    if ext in ('.feather', '.arrow', '.ipc'):
+        return 'ipc'
+    return 'csv'
+
+
+def empty_rollup(by: list[str]) -> pd.DataFrame:
+    df = pd.DataFrame({col: [] for col in by + MEASURES + ['count']}).astype({measure: 'float64' for measure in MEASURES})
+    return df.set_index(by) if by else df
+
+
+def finish_rollup(df: pd.DataFrame, by: list[str]) -> pd.DataFrame:
+    # Same shape as a SalesCube rollup: every measure's sum and the row count, indexed by
+    # the group keys in sorted order
+    df = df[by + MEASURES + ['count']].astype({measure: 'float64' for measure in MEASURES})
+    if not by:
+        return df
+    return df.set_index(by).sort_index()
+
+
+class ArrowEngine:
+    # pyarrow.dataset scan -> filter -> project -> hash aggregate, streamed batch by batch
+    # by Acero. Only the key, measure and filter columns are read, and the filters are
+    # pushed into the scan so Parquet row groups and hive partitions can be skipped.
+    def __init__(self, path: str):
+        import pyarrow as pa
+        import pyarrow.csv as pcsv
+        import pyarrow.dataset as ds
+
+        self.pa = pa
+        fmt = source_format(path)
+        self.trim = fmt == 'csv'
+        if fmt == 'csv':
+            fmt = ds.CsvFileFormat(convert_options=pcsv.ConvertOptions(
+                timestamp_parsers=[DATE_FORMAT], column_types={col: pa.timestamp('s') for col in DATE_COLS}))
+        self.dataset = ds.dataset(path, format=fmt, partitioning='hive' if os.path.isdir(path) else None)
+        self.columns = set(self.dataset.schema.names)
+
+    def key_expression(self, col):
+        import pyarrow.compute as pc
+        if col in TIME_KEYS and col not in self.columns:
+            return getattr(pc, col)(pc.field('Order Date')), ['Order Date']
+        if self.trim and col in CATEGORY_COLS:
+            # CSV exports pad some values with spaces, the pandas loader strips them too
+            return pc.utf8_trim_whitespace(pc.field(col)), [col]
+        return pc.field(col), [col]
+
+    def filter_expression(self, filters):
+        import pyarrow.compute as pc
+        if filters is None:
+            return None, []
+        start, end, categories = filters
+        expr, columns = None, []
+        date_type = self.dataset.schema.field('Order Date').type
+        conditions = []
+        if start is not None:
+            conditions.append(pc.field('Order Date') >= self.pa.scalar(start, type=date_type))
+        if end is not None:
+            conditions.append(pc.field('Order Date') <= self.pa.scalar(end, type=date_type))
+        if start is not None or end is not None:
+            columns.append('Order Date')
+        for col, values in categories:
+            key, needed = self.key_expression(col)
+            conditions.append(key.isin(list(values)))
+            columns += needed
+        for condition in conditions:
+            expr = condition if expr is None else expr & condition
+        return expr, columns
+
+    def aggregate(self, by: list[str], filters=None) -> pd.DataFrame:
+        from pyarrow import acero
+        import pyarrow.compute as pc
+
+        keys = [self.key_expression(col) for col in by]
+        expr, filter_columns = self.filter_expression(filters)
+        columns = list(dict.fromkeys([c for _, needed in keys for c in needed] + MEASURES + filter_columns))
+
+        plan = [acero.Declaration('scan', acero.ScanNodeOptions(self.dataset, columns=columns, filter=expr))]
+        if expr is not None:
+            # The scan filter only prunes files and row groups, rows are filtered here
+            plan.append(acero.Declaration('filter', acero.FilterNodeOptions(expr)))
+        plan.append(acero.Declaration('project', acero.ProjectNodeOptions(
+            [key for key, _ in keys] + [pc.field(measure) for measure in MEASURES], by + MEASURES)))
+        prefix = 'hash_' if by else ''
+        aggregates = [(measure, f'{prefix}sum', None, measure) for measure in MEASURES]
+        aggregates.append(([], f'{prefix}count_all', None, 'count'))
+        plan.append(acero.Declaration('aggregate', acero.AggregateNodeOptions(aggregates, keys=by or None)))
+
+        df = acero.Declaration.from_sequence(plan).to_table().to_pandas()
+        if by and df.empty:
+            return empty_rollup(by)
+        return finish_rollup(df, by)
+
+
+class DuckDBEngine:
+    # Embedded DuckDB reading Parquet or CSV files in place. Each rollup is one
+    # GROUP BY query, DuckDB pushes the projection and the WHERE clause into the scan.
+    def __init__(self, path: str):
+        try:
+            import duckdb
+        except ImportError:
+            raise ImportError("the duckdb backend needs duckdb, install it with 'pip install duckdb'") from None
+
+        fmt = source_format(path)
+        if fmt == 'ipc':
+            raise ValueError("duckdb reads Parquet and CSV files, use the arrow backend for Feather files")
+        self.trim = fmt == 'csv'
+        quoted = "'" + path.replace("'", "''") + "'"
+        if fmt == 'parquet':
+            pattern = "'" + os.path.join(path, '**', '*.parquet').replace("'", "''") + "'" if os.path.isdir(path) else quoted
+            self.source = f"read_parquet({pattern}, hive_partitioning = true)"
+        else:
+            self.source = f"read_csv({quoted}, header = true, dateformat = '{DATE_FORMAT}')"
+        self.con = duckdb.connect()
+        self.columns = {row[0] for row in self.con.execute(f"DESCRIBE SELECT * FROM {self.source}").fetchall()}
+
+    def key_sql(self, col):
+        if col in TIME_KEYS and col not in self.columns:
+            return f'{col}("Order Date")'
+        if self.trim and col in CATEGORY_COLS:
+            return f'trim("{col}")'
+        return f'"{col}"'
+
+    def where_sql(self, filters):
+        if filters is None:
+            return '', []
+        start, end, categories = filters
+        conditions, params = [], []
+        if start is not None:
+            conditions.append('"Order Date" >= ?')
+            params.append(start.to_pydatetime())
+        if end is not None:
+            conditions.append('"Order Date" <= ?')
+            params.append(end.to_pydatetime())
+        for col, values in categories:
+            conditions.append(f"{self.key_sql(col)} IN ({', '.join('?' for _ in values)})")
+            params += list(values)
+        return ('WHERE ' + ' AND '.join(conditions) if conditions else ''), params
+
+    def aggregate(self, by: list[str], filters=None) -> pd.DataFrame:
+        keys = [f'{self.key_sql(col)} AS "{col}"' for col in by]
+        where, params = self.where_sql(filters)
+        sums = [f'sum("{measure}") AS "{measure}"' for measure in MEASURES]
+        select = ', '.join(keys + sums + ['count(*) AS count'])
+        sql = f'SELECT {select} FROM {self.source} {where}'
+        if by:
+            sql += f' GROUP BY {", ".join(str(i + 1) for i in range(len(by)))}'
+
+        # A cursor per query, the dashboard runs rollups on several worker threads
+        df = self.con.cursor().execute(sql, params).df()
+        if by and df.empty:
+            return empty_rollup(by)
+        return finish_rollup(df, by)
+
+
+ENGINES = {'arrow': ArrowEngine, 'duckdb': DuckDBEngine}
+
+
+def open_engine(backend: str, path: str):
+    return ENGINES[backend](path)
+
+
+class QueryCube:
+    # Same interface as SalesCube, every rollup is a query pushed down to the engine.
+    # One query per grouping sums every measure, like a SalesCube rollup, and is memoized.
+    # A cube is one fixed set of filters.
+    def __init__(self, engine, filters=None):
+        self.engine = engine
+        self.filters = filters
+        self._rollups = {}
+
+    def _rollup(self, by: list[str]) -> pd.DataFrame:
+        key = tuple(by)
+        if key not in self._rollups:
+            self._rollups[key] = self.engine.aggregate(list(by), self.filters)
+        return self._rollups[key]
+
+    def sum(self, by: list[str], measure: str) -> pd.Series:
+        return self._rollup(by)[measure]
+
+    def mean(self, by: list[str], measure: str) -> pd.Series:
+        rollup = self._rollup(by)
+        return (rollup[measure] / rollup['count']).rename(measure)
+
+    def by_day(self, measure: str) -> pd.Series:
+        daily = self.sum(['Order Date'], measure)
+        daily.index = pd.DatetimeIndex(daily.index, name='Order Date')
+        return daily
+
+    def total(self, measure: str) -> float:
+        rollup = self._rollup([])
+        return float(rollup[measure].iloc[0]) if len(rollup) and pd.notna(rollup[measure].iloc[0]) else 0.0
+
+    def regions(self) -> list[str]:
+        return sorted(self.sum(['Region'], 'Total Revenue').index)
+
+    def values(self, col: str) -> list[str]:
+        return sorted(self.sum([col], 'Units Sold').index)
@@ -0,0 +1,65 @@
+import pandas as pd
+
+# Dimensions and measures kept in the pre-aggregated cube
+DIMENSIONS = ['Region', 'Country', 'Item Type', 'Sales Channel', 'year', 'month']
+MEASURES = ['Units Sold', 'Unit Price', 'Unit Cost', 'Total Revenue', 'Total Cost', 'Total Profit']
+
+MONTH_NAMES = ['January', 'February', 'March', 'April', 'May', 'June',
+               'July', 'August', 'September', 'October', 'November', 'December']
+
+
+def build_cells(df: pd.DataFrame) -> pd.DataFrame:
+    grouped = df.groupby(DIMENSIONS, observed=True, sort=False)
+    cells = grouped[MEASURES].sum().astype('float64')
+    cells['count'] = grouped.size()
+    return cells.reset_index()
+
+
+def build_daily(df: pd.DataFrame) -> pd.DataFrame:
+    # Sums per order day, the time series view resamples these to weeks, quarters and so on
+    grouped = df.groupby('Order Date', sort=True)
+    daily = grouped[MEASURES].sum().astype('float64')
+    daily['count'] = grouped.size()
+    return daily
+
+
+class SalesCube:
+    # One pass over the rows builds sums and counts per dimension combination,
+    # every view and KPI is then a rollup of these cells instead of the raw data
+    def __init__(self, df: pd.DataFrame | None = None, cells: pd.DataFrame | None = None,
+                 daily: pd.DataFrame | None = None):
+        self.cells = build_cells(df) if cells is None else cells
+        self.daily = build_daily(df) if daily is None else daily
+
+        # Rollups are memoized, the cube never changes once built
+        self._rollups = {}
+
+    def merge(self, df: pd.DataFrame) -> 'SalesCube':
+        # A new cube with the rows of df added, only the existing cells are regrouped,
+        # never the rows they were built from
+        cells = pd.concat([self.cells, build_cells(df)], ignore_index=True)
+        cells = cells.groupby(DIMENSIONS, observed=True, sort=False)[MEASURES + ['count']].sum()
+        daily = pd.concat([self.daily, build_daily(df)]).groupby(level=0, sort=True).sum()
+        return SalesCube(cells=cells.reset_index(), daily=daily)
+
+    def _rollup(self, by: list[str]) -> pd.DataFrame:
+        key = tuple(by)
+        if key not in self._rollups:
+            self._rollups[key] = self.cells.groupby(by, observed=True)[MEASURES + ['count']].sum()
+        return self._rollups[key]
+
+    def sum(self, by: list[str], measure: str) -> pd.Series:
+        return self._rollup(by)[measure]
+
+    def mean(self, by: list[str], measure: str) -> pd.Series:
+        rollup = self._rollup(by)
+        return (rollup[measure] / rollup['count']).rename(measure)
+
+    def by_day(self, measure: str) -> pd.Series:
+        return self.daily[measure]
+
+    def total(self, measure: str) -> float:
+        return self.cells[measure].sum()
+
+    def regions(self) -> list[str]:
+        return sorted(self.cells['Region'].unique())
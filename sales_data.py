@@ -0,0 +1,493 @@
+import glob
+import hashlib
+import io
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+DATA_FILE = "5000 Sales Records.csv"
+
+# Explicit schema for the sales exports
+CATEGORY_COLS = ['Region', 'Country', 'Item Type', 'Sales Channel', 'Order Priority']
+DATE_COLS = ['Order Date', 'Ship Date']
+DATE_FORMAT = '%m/%d/%Y'
+NUMERIC_DTYPES = {
+    'Units Sold': 'int32',
+    'Unit Price': 'float32',
+    'Unit Cost': 'float32',
+    # Totals run into the millions, float32 would lose the cents
+    'Total Revenue': 'float64',
+    'Total Cost': 'float64',
+    'Total Profit': 'float64',
+}
+NUMERIC_COLS = list(NUMERIC_DTYPES)
+
+# Compact time keys derived once from 'Order Date' at load time
+TIME_KEY_DTYPES = {'year': 'int16', 'month': 'int8', 'quarter': 'int8', 'month ordinal': 'int32'}
+
+# Cleaning steps reported by the loader, in the order they are applied
+CLEANING_STEPS = ['missing values', 'bad dates', 'non-numeric values', 'duplicates']
+
+
+def clean_chunk(df: pd.DataFrame, stats: dict) -> pd.DataFrame:
+    # Check if all required columns exist, raise KeyError if not
+    missing_cols = [col for col in NUMERIC_COLS if col not in df.columns]
+    if missing_cols:
+        raise KeyError(f"Missing columns in the dataset: {missing_cols}")
+
+    stats['rows read'] += len(df)
+    missing = df.isna().any(axis=1)
+
+    # Strip whitespace from string columns so padded copies of a row match
+    for col in df.columns:
+        if df[col].dtype == object:
+            df[col] = df[col].str.strip()
+
+    # Parse dates with a fixed format, unparseable dates become NaT
+    for col in DATE_COLS:
+        df[col] = pd.to_datetime(df[col], format=DATE_FORMAT, errors='coerce')
+    bad_dates = df[DATE_COLS].isna().any(axis=1) & ~missing
+
+    # Convert to numeric, coerce errors to NaN
+    df[NUMERIC_COLS] = df[NUMERIC_COLS].apply(pd.to_numeric, errors='coerce')
+    non_numeric = df[NUMERIC_COLS].isna().any(axis=1) & ~missing & ~bad_dates
+
+    stats['missing values'] += int(missing.sum())
+    stats['bad dates'] += int(bad_dates.sum())
+    stats['non-numeric values'] += int(non_numeric.sum())
+    df = df[~(missing | bad_dates | non_numeric)]
+
+    n = len(df)
+    df = df.drop_duplicates()
+    stats['duplicates'] += n - len(df)
+
+    # Downcast to the compact schema
+    df = df.astype(NUMERIC_DTYPES)
+    for col in CATEGORY_COLS:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    return add_time_keys(df)
+
+
+def add_time_keys(df: pd.DataFrame) -> pd.DataFrame:
+    # Views group on these integer columns instead of copying the frame to derive them
+    order_date = df['Order Date'].dt
+    df['year'] = order_date.year.astype(TIME_KEY_DTYPES['year'])
+    df['month'] = order_date.month.astype(TIME_KEY_DTYPES['month'])
+    df['quarter'] = order_date.quarter.astype(TIME_KEY_DTYPES['quarter'])
+    df['month ordinal'] = (df['year'].astype('int32') * 12 + df['month'] - 1).astype(TIME_KEY_DTYPES['month ordinal'])
+    return df
+
+
+def new_load_stats() -> dict:
+    return dict.fromkeys(['rows read'] + CLEANING_STEPS + ['rows kept'], 0)
+
+
+def load_sales_csv(path: str = DATA_FILE, chunksize: int = 500_000, stats: dict | None = None) -> pd.DataFrame:
+    # Stream the CSV in chunks so only one raw chunk is in memory at a time
+    if stats is None:
+        stats = new_load_stats()
+
+    chunks = []
+    hashes = []
+    dtype = {col: object for col in CATEGORY_COLS + DATE_COLS}
+    with pd.read_csv(path, chunksize=chunksize, dtype=dtype) as reader:
+        for chunk in reader:
+            chunk = clean_chunk(chunk, stats)
+            chunks.append(chunk)
+            # Keep one 8-byte hash per row to catch duplicates that span chunks
+            hashes.append(pd.util.hash_pandas_object(chunk, index=False).to_numpy())
+
+    if not chunks:
+        return pd.DataFrame()
+
+    # Drop rows already seen in an earlier chunk
+    keep = ~pd.Series(np.concatenate(hashes)).duplicated().to_numpy()
+    if not keep.all():
+        stats['duplicates'] += int((~keep).sum())
+        offsets = np.cumsum([0] + [len(c) for c in chunks])
+        chunks = [c[keep[start:end]] for c, start, end in zip(chunks, offsets[:-1], offsets[1:])]
+
+    # Rows are kept in date order so date ranges can be found by binary search
+    df = concat_chunks(chunks).sort_values('Order Date', kind='stable', ignore_index=True)
+    stats['rows kept'] = len(df)
+    return df
+
+
+def concat_chunks(chunks: list[pd.DataFrame]) -> pd.DataFrame:
+    # Each chunk has its own categories, union them so the result stays categorical
+    categorical = {col: union_categoricals([c[col] for c in chunks])
+                   for col in CATEGORY_COLS if col in chunks[0].columns}
+    df = pd.concat([c.drop(columns=list(categorical)) for c in chunks], ignore_index=True)
+    for col, values in categorical.items():
+        df[col] = values
+    return df[chunks[0].columns]
+
+
+def print_load_stats(stats: dict):
+    if stats.get('cache'):
+        print(f"Loaded {stats['rows kept']:,} rows from cache {stats['cache']}")
+        return
+    shards = f" from {stats['shards']} shards" if stats.get('shards') else ""
+    print(f"Loaded {stats['rows kept']:,} of {stats['rows read']:,} rows{shards}")
+    for step in CLEANING_STEPS:
+        print(f"  dropped {stats[step]:,} rows with {step}")
+
+
+# On-disk cache of the cleaned frame, stored next to the source file
+CACHE_DIR = ".sales_cache"
+CACHE_VERSION = 3
+
+
+def file_digest(path: str) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def cache_path_for(path: str) -> str:
+    path = os.path.abspath(path)
+    name_hash = hashlib.blake2b(path.encode(), digest_size=8).hexdigest()
+    return os.path.join(os.path.dirname(path), CACHE_DIR, f"{os.path.basename(path)}.{name_hash}.feather")
+
+
+def source_key(path: str, digest: str | None = None) -> dict:
+    st = os.stat(path)
+    return {
+        'version': CACHE_VERSION,
+        'path': os.path.abspath(path),
+        'size': st.st_size,
+        'mtime_ns': st.st_mtime_ns,
+        'digest': digest,
+    }
+
+
+def open_cache(path: str):
+    # (table, digest): the cached table or None, and the content hash if one was computed,
+    # so a cache miss doesn't hash the source a second time
+    import pyarrow as pa
+    import pyarrow.ipc
+
+    cache_path = cache_path_for(path)
+    if not os.path.exists(cache_path):
+        return None, None
+
+    # Memory-map the Arrow file so columns are paged in rather than parsed,
+    # the returned table keeps the mapping open
+    reader = pa.ipc.open_file(pa.memory_map(cache_path))
+    cached = json.loads((reader.schema.metadata or {}).get(b'sales_cache', b'{}'))
+    key = source_key(path)
+    if cached.get('version') != key['version'] or cached.get('path') != key['path'] or cached.get('size') != key['size']:
+        return None, None
+    if cached.get('mtime_ns') == key['mtime_ns']:
+        return reader.read_all(), None
+
+    # A touched but unchanged file keeps its cache, the content hash decides
+    digest = file_digest(path)
+    if cached.get('digest') != digest:
+        return None, digest
+    # Stored with the new mtime so later launches skip the hash
+    table = reader.read_all()
+    key['digest'] = digest
+    write_table(table, path, key)
+    return table, digest
+
+
+def read_cache(path: str) -> tuple[pd.DataFrame | None, str | None]:
+    table, digest = open_cache(path)
+    return (None if table is None else table.to_pandas()), digest
+
+
+def write_table(table, path: str, key: dict) -> bool:
+    import pyarrow.feather
+
+    metadata = dict(table.schema.metadata or {})
+    metadata[b'sales_cache'] = json.dumps(key).encode()
+    table = table.replace_schema_metadata(metadata)
+
+    # Uncompressed so the file can be memory-mapped, written atomically. The cache is
+    # only a speed-up, a read-only or shared data directory just goes without it
+    cache_path = cache_path_for(path)
+    tmp_path = cache_path + '.tmp'
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        pyarrow.feather.write_feather(table, tmp_path, compression='uncompressed')
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"Warning: could not write the cache {cache_path}: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return False
+    return True
+
+
+def write_cache(df: pd.DataFrame, path: str, key: dict) -> bool:
+    import pyarrow as pa
+    return write_table(pa.Table.from_pandas(df, preserve_index=False), path, key)
+
+
+def load_sales_cached(path: str = DATA_FILE, chunksize: int = 500_000, stats: dict | None = None,
+                      rebuild: bool = False, digest: str | None = None) -> pd.DataFrame:
+    # digest is the content hash of path if the caller already computed it
+    if stats is None:
+        stats = new_load_stats()
+
+    if not rebuild:
+        df, digest = read_cache(path)
+        if df is not None:
+            stats['rows read'] = stats['rows kept'] = len(df)
+            stats['cache'] = cache_path_for(path)
+            return df
+
+    # Key the cache before parsing so a file rewritten mid-load is not cached as current.
+    # A changed file was already hashed by open_cache, that digest is reused
+    key = source_key(path, digest or file_digest(path))
+    df = load_sales_csv(path, chunksize, stats)
+    write_cache(df, path, key)
+    return df
+
+
+def is_sharded(path: str) -> bool:
+    return os.path.isdir(path) or any(c in path for c in '*?[')
+
+
+def shard_paths(path: str) -> list[str]:
+    # A directory means every CSV in it, anything else is a glob pattern
+    pattern = os.path.join(path, '*.csv') if os.path.isdir(path) else path
+    paths = sorted(glob.glob(pattern))
+    if not paths:
+        raise FileNotFoundError(path)
+    return paths
+
+
+def parse_shard(path: str, chunksize: int, use_cache: bool, rebuild: bool):
+    # Runs in a worker process with the same cleaning as a single file. The cleaned shard
+    # goes back as Arrow IPC: the path of its cache file, which the parent memory-maps,
+    # or an IPC stream buffer when caching is off. Neither is pickled column by column.
+    import pyarrow as pa
+    import pyarrow.ipc
+
+    stats = new_load_stats()
+    if use_cache:
+        table, digest = (None, None) if rebuild else open_cache(path)
+        if table is not None:
+            stats['rows read'] = stats['rows kept'] = table.num_rows
+            return cache_path_for(path), None, stats
+        df = load_sales_cached(path, chunksize, stats, rebuild=True, digest=digest)
+        if open_cache(path)[0] is not None:
+            return cache_path_for(path), None, stats
+        # The cache could not be written, the rows go back as a stream
+    else:
+        df = load_sales_csv(path, chunksize, stats)
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return None, sink.getvalue(), stats
+
+
+def load_sales_shards(paths: list[str], chunksize: int = 500_000, stats: dict | None = None,
+                      use_cache: bool = True, rebuild: bool = False, workers: int | None = None) -> pd.DataFrame:
+    import pyarrow as pa
+    import pyarrow.ipc
+
+    if stats is None:
+        stats = new_load_stats()
+
+    # One shard per task, the results are read in shard order so the first copy of an order wins
+    frames = []
+    workers = min(workers or os.cpu_count() or 1, len(paths))
+    with ProcessPoolExecutor(workers) as pool:
+        futures = [pool.submit(parse_shard, path, chunksize, use_cache, rebuild) for path in paths]
+        for future in futures:
+            cache_file, stream, shard_stats = future.result()
+            for step in new_load_stats():
+                stats[step] += shard_stats[step]
+            if cache_file is not None:
+                table = pa.ipc.open_file(pa.memory_map(cache_file)).read_all()
+            else:
+                table = pa.ipc.open_stream(stream).read_all()
+            if table.num_rows:
+                frames.append(table.to_pandas())
+
+    stats['shards'] = len(paths)
+    if not frames:
+        return pd.DataFrame()
+
+    # The same order exported in two shards is kept once
+    df = concat_chunks(frames)
+    keep = ~df['Order ID'].duplicated().to_numpy()
+    stats['duplicates'] += int((~keep).sum())
+    df = df[keep].sort_values('Order Date', kind='stable', ignore_index=True)
+    stats['rows kept'] = len(df)
+    return df
+
+
+class OrderIdSet:
+    # Long-lived set of Order IDs kept as one sorted int64 array,
+    # membership is a binary search and adding is a merge of sorted runs
+    def __init__(self, ids=()):
+        self.ids = np.unique(np.asarray(ids, dtype=np.int64))
+
+    def __len__(self):
+        return len(self.ids)
+
+    def contains(self, ids) -> np.ndarray:
+        ids = np.asarray(ids, dtype=np.int64)
+        if not len(self.ids):
+            return np.zeros(len(ids), dtype=bool)
+        pos = np.minimum(np.searchsorted(self.ids, ids), len(self.ids) - 1)
+        return self.ids[pos] == ids
+
+    def add(self, ids):
+        ids = np.unique(np.asarray(ids, dtype=np.int64))
+        merged = np.concatenate([self.ids, ids[~self.contains(ids)]])
+        merged.sort(kind='stable')
+        self.ids = merged
+
+
+# Bytes read back at a time when looking for the last complete line of a file
+TAIL_BLOCK = 64 * 1024
+
+
+def last_line_end(f, start: int, stop: int) -> int:
+    # Offset just past the last newline in bytes start..stop of f, start if there is none
+    pos = stop
+    while pos > start:
+        block = max(start, pos - TAIL_BLOCK)
+        f.seek(block)
+        i = f.read(pos - block).rfind(b'\n')
+        if i >= 0:
+            return block + i + 1
+        pos = block
+    return start
+
+
+class FileRange(io.RawIOBase):
+    # Bytes start..stop of an open file as a stream, read_csv reads it in chunks
+    def __init__(self, f, start: int, stop: int):
+        self.f = f
+        self.f.seek(start)
+        self.remaining = stop - start
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self.f.read(min(len(buffer), self.remaining))
+        buffer[:len(data)] = data
+        self.remaining -= len(data)
+        return len(data)
+
+
+class SalesFileWatcher:
+    # Picks up sales CSVs dropped into a directory, and rows appended to files
+    # already seen, reading each file from where the previous poll stopped
+    def __init__(self, directory: str, pattern: str = '*.csv', seen_ids: OrderIdSet | None = None,
+                 chunksize: int = 500_000):
+        self.directory = directory
+        self.pattern = pattern
+        self.seen_ids = seen_ids if seen_ids is not None else OrderIdSet()
+        self.chunksize = chunksize
+        self.offsets = {}
+        self.headers = {}
+
+        # Offsets, headers and Order IDs of the last poll, applied by commit() once its
+        # rows are handed off. A failed batch is read again on the next poll
+        self.pending = None
+
+    def read_header(self, f) -> tuple[list[str], int] | None:
+        f.seek(0)
+        line = f.readline()
+        if not line.endswith(b'\n'):
+            return None
+        return list(pd.read_csv(io.BytesIO(line), nrows=0).columns), len(line)
+
+    def start_at(self, path: str, size: int):
+        # A file that was already loaded is read on from `size`, rounded back to a line start
+        path = os.path.abspath(path)
+        with open(path, 'rb') as f:
+            header = self.read_header(f)
+            if header is not None:
+                self.headers[path] = header[0]
+                self.offsets[path] = max(header[1], last_line_end(f, 0, size))
+
+    def read_new_rows(self, path: str, stats: dict):
+        # Cleaned rows between the file's offset and its last complete line, with the new
+        # offset and the header, or None when there is nothing new
+        size = os.path.getsize(path)
+        offset = self.offsets.get(path, 0)
+        if size < offset:
+            # The file was replaced, read it again, Order IDs filter what was already ingested
+            offset = 0
+        if size == offset:
+            return None
+
+        with open(path, 'rb') as f:
+            header = self.headers.get(path) if offset else None
+            if offset == 0:
+                read = self.read_header(f)
+                if read is None:
+                    return None
+                header, offset = read
+
+            # Leave a partly written last line for the next poll
+            end = last_line_end(f, offset, size)
+            if end == offset:
+                return pd.DataFrame(), offset, header
+
+            # Streamed chunk by chunk, an unread multi-GB file is never in memory as text
+            dtype = {col: object for col in CATEGORY_COLS + DATE_COLS}
+            with pd.read_csv(io.BufferedReader(FileRange(f, offset, end)), header=None, names=header,
+                             dtype=dtype, chunksize=self.chunksize) as reader:
+                chunks = [clean_chunk(chunk, stats) for chunk in reader]
+        df = concat_chunks(chunks) if chunks else pd.DataFrame()
+        return df, end, header
+
+    def poll(self, stats: dict) -> pd.DataFrame | None:
+        self.pending = None
+        offsets, headers, chunks = {}, {}, []
+        for path in sorted(glob.glob(os.path.join(self.directory, self.pattern))):
+            path = os.path.abspath(path)
+            try:
+                read = self.read_new_rows(path, stats)
+            except (KeyError, ValueError, pd.errors.ParserError) as e:
+                # A broken file is retried on the next poll, the other files still come in
+                print(f"Error: skipping '{path}' for now, {e}")
+                continue
+            if read is None:
+                continue
+            df, offsets[path], headers[path] = read
+            if len(df):
+                chunks.append(df)
+        self.pending = (offsets, headers, None)
+        if not chunks:
+            return None
+
+        # Deduplicate on Order ID, within the batch and against every row ingested before
+        df = concat_chunks(chunks)
+        order_ids = df['Order ID'].to_numpy()
+        keep = ~df['Order ID'].duplicated().to_numpy() & ~self.seen_ids.contains(order_ids)
+        stats['duplicates'] += int((~keep).sum())
+        df = df[keep].reset_index(drop=True)
+        self.pending = (offsets, headers, df['Order ID'].to_numpy())
+        stats['rows kept'] = len(df)
+        return df
+
+    def commit(self):
+        # The last poll's rows were handed off: move past their bytes and remember their Order IDs
+        if self.pending is None:
+            return
+        offsets, headers, order_ids = self.pending
+        self.offsets.update(offsets)
+        self.headers.update(headers)
+        if order_ids is not None:
+            self.seen_ids.add(order_ids)
+        self.pending = None
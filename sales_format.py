@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+
+
+# Powers of ten used to pick digits out of integers
+POW10 = 10 ** np.arange(19, dtype=np.int64)
+
+# Label of an amount that doesn't exist, e.g. the mean over no rows
+NO_VALUE = '—'
+
+
+def format_fixed(values, decimals=0) -> np.ndarray:
+    # Same text as f'{x:.{decimals}f}' for every element. The digits are computed
+    # as a byte matrix, one row per value, instead of formatting values one by one
+    values = np.atleast_1d(np.asarray(values, dtype='float64'))
+    shape = values.shape
+    values = values.ravel()
+    if not len(values):
+        return np.array([], dtype=str).reshape(shape)
+    finite = np.isfinite(values)
+    scale = 10 ** decimals
+    product = np.where(finite, np.abs(values), 0) * scale
+
+    # From 2**52 on the scaled product is no longer exact to the half unit and past 2**63 it
+    # overflows int64, those values are formatted by Python at the end like the non-finite ones
+    large = product >= 2.0 ** 52
+    product[large] = 0
+    scaled = np.rint(product)
+
+    # An exact .5 after scaling may hide a value just above or below the tie,
+    # those few elements are rounded by Python's correctly rounded formatting
+    ties = product % 1 == 0.5
+    if ties.any():
+        scaled[ties] = [int(f'{abs(v):.{decimals}f}'.replace('.', '')) for v in values[ties]]
+
+    whole, fraction = np.divmod(scaled.astype(np.int64), scale)
+    negative = (np.signbit(values) & finite).astype(np.int64)
+    int_len = np.maximum(np.searchsorted(POW10, whole, side='right'), 1)
+    width = int((negative + int_len).max()) + (decimals + 1 if decimals else 0)
+
+    # Column j of a row holds the sign, an integer digit, the point or a fraction digit
+    j = np.arange(width)[None, :] - negative[:, None]
+    e = int_len[:, None] - 1 - j
+    chars = np.where((j >= 0) & (e >= 0), (whole[:, None] // POW10[np.clip(e, 0, 18)]) % 10 + 48, 0)
+    if decimals:
+        k = j - int_len[:, None] - 1
+        fraction_digits = (fraction[:, None] // POW10[np.clip(decimals - 1 - k, 0, 18)]) % 10 + 48
+        chars = np.where(k == -1, ord('.'), chars)
+        chars = np.where((k >= 0) & (k < decimals), fraction_digits, chars)
+    chars[:, 0] = np.where(negative == 1, ord('-'), chars[:, 0])
+
+    # Trailing NUL bytes are dropped when the rows are read back as strings
+    text = chars.astype(np.uint8).view(f'S{width}').ravel().astype(str)
+    if not finite.all():
+        special = np.where(np.isnan(values), 'nan', np.where(values < 0, '-inf', 'inf'))
+        text = np.where(finite, text, special)
+    if large.any():
+        text = text.astype(object)
+        text[large] = [f'{v:.{decimals}f}' for v in values[large]]
+        text = text.astype(str)
+    return text.reshape(shape)
+
+
+def format_BM(values, till=0, dol='$'):
+    # Vectorized Dashboard.add_BM: a whole Series or array of amounts scaled to $M labels at once
+    arr = np.asarray(values, dtype='float64')
+    out = np.full(arr.shape, f'{dol}0', dtype=object)
+
+    # Each branch of add_BM is formatted only for the values that take it
+    missing = np.isnan(arr)
+    out[missing] = NO_VALUE
+    billions = arr >= 1_000_000_000
+    millions = (arr >= 1_000_000) & ~billions
+    small = ~(arr >= 1_000_000) & (arr != 0) & ~missing
+    if billions.any():
+        b = arr[billions]
+        out[billions] = np.char.add(np.char.add(np.char.add(np.char.add(dol, format_fixed(b // 1_000_000_000, 0)), ','),
+                                                format_fixed(b / 10_000_000, till)), 'M')
+    if millions.any():
+        out[millions] = np.char.add(np.char.add(dol, format_fixed(arr[millions] / 1_000_000, till)), 'M')
+    if small.any():
+        out[small] = np.char.add(np.char.add(dol, format_fixed(arr[small] / 1_000_000, 1)), 'M')
+
+    if isinstance(values, pd.Series):
+        return pd.Series(out, index=values.index, name=values.name)
+    if isinstance(values, pd.DataFrame):
+        return pd.DataFrame(out, index=values.index, columns=values.columns)
+    return out
+
+
+def text_column(values, col_width: int) -> np.ndarray:
+    # Left-justified fixed-width cells for a whole column
+    return np.char.ljust(np.asarray(values).astype(str), col_width)
+
+
+def join_columns(columns: list, row_end: str) -> list[str]:
+    # Glue the cells of each row together, one array operation per column
+    rows = np.char.add('| ', columns[0])
+    for column in columns[1:]:
+        rows = np.char.add(np.char.add(rows, '|  '), column)
+    return np.char.add(rows, row_end).tolist()
@@ -0,0 +1,174 @@
+import threading
+import tkinter as tk
+from collections import OrderedDict
+from tkinter import ttk
+
+import numpy as np
+import pandas as pd
+
+from sales_data import DATE_COLS, TIME_KEY_DTYPES
+
+# Rows the grid shows at once, the Treeview never holds more items than this
+PAGE_ROWS = 30
+
+# Rows moved per mouse wheel notch
+WHEEL_ROWS = 3
+
+# Columns whose sort orders are kept, each costs one position per row of the selection
+SORT_ORDERS = 4
+
+# How often the grid checks for a sort running on the worker pool
+SORT_POLL_MS = 30
+
+
+def sort_key(values: pd.Series) -> np.ndarray:
+    # Categories sort by their text, not by their code
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        ranks = np.empty(len(values.cat.categories), dtype=np.int64)
+        ranks[np.argsort(np.asarray(values.cat.categories, dtype=str), kind='stable')] = np.arange(len(ranks))
+        return ranks[values.cat.codes.to_numpy()]
+    return values.to_numpy()
+
+
+class DrillRows:
+    # Positions of the orders behind one bar into the data frame. Only a page of rows is ever
+    # materialized, a sort is one argsort of the selection, kept per column for re-use
+    def __init__(self, data: pd.DataFrame, rows: np.ndarray):
+        self.data = data
+        self.rows = rows
+        self.columns = [col for col in data.columns if col not in TIME_KEY_DTYPES]
+
+        # Sorts run on the worker pool while the grid reads the orders already kept
+        self._orders = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def order(self, col: str) -> np.ndarray:
+        # Ascending order of the selection by col, stable so ties stay in date order
+        with self._lock:
+            if col in self._orders:
+                self._orders.move_to_end(col)
+                return self._orders[col]
+        order = np.argsort(sort_key(self.data[col].iloc[self.rows]), kind='stable')
+        with self._lock:
+            self._orders[col] = order
+            while len(self._orders) > SORT_ORDERS:
+                self._orders.popitem(last=False)
+        return order
+
+    def page(self, start: int, stop: int, sort: tuple[str, bool] | None = None) -> pd.DataFrame:
+        # Rows start..stop of the selection in the shown order, sort is (column, descending)
+        if sort is None:
+            positions = self.rows[start:stop]
+        else:
+            col, descending = sort
+            order = self.order(col)
+            if descending:
+                order = order[::-1]
+            positions = self.rows[order[start:stop]]
+        return self.data.iloc[positions][self.columns]
+
+
+def format_page(page: pd.DataFrame) -> list[list[str]]:
+    columns = []
+    for col in page.columns:
+        values = page[col]
+        if col in DATE_COLS:
+            columns.append(values.dt.strftime('%Y-%m-%d').tolist())
+        elif pd.api.types.is_float_dtype(values):
+            columns.append([f'{v:,.2f}' for v in values])
+        elif pd.api.types.is_integer_dtype(values):
+            columns.append([f'{v:,}' for v in values])
+        else:
+            columns.append([str(v) for v in values])
+    return [list(row) for row in zip(*columns)]
+
+
+class OrderGrid:
+    # Toplevel with a Treeview of the orders behind a bar. The Treeview holds PAGE_ROWS items
+    # whose values are swapped on scroll, the scrollbar is driven by the row position
+    def __init__(self, root, title: str, rows: DrillRows, executor):
+        self.rows = rows
+        self.first = 0
+        self.sort = None
+
+        # Column sorts are argsorts of the whole selection, computed on the dashboard's workers
+        self.executor = executor
+        self.sorting = None
+
+        self.window = tk.Toplevel(root)
+        self.window.title(f"{title} ({len(rows):,} orders)")
+        self.window.geometry("1400x720")
+
+        frame = ttk.Frame(self.window)
+        frame.pack(side=tk.TOP, fill=tk.BOTH, expand=True, padx=10, pady=10)
+        self.tree = ttk.Treeview(frame, columns=rows.columns, show="headings", height=PAGE_ROWS, selectmode="browse")
+        for col in rows.columns:
+            self.tree.heading(col, text=col, command=lambda col=col: self.sort_by(col))
+            self.tree.column(col, width=110, stretch=True, anchor=tk.W)
+        self.scrollbar = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=self.yview)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self.status_var = tk.StringVar(value="")
+        ttk.Label(self.window, textvariable=self.status_var).pack(side=tk.BOTTOM, anchor=tk.W, padx=10, pady=(0, 8))
+
+        # Wheel and keys scroll the selection, not the Treeview's own few items
+        self.tree.bind("<MouseWheel>", lambda e: self.scroll_to(self.first - WHEEL_ROWS * (1 if e.delta > 0 else -1)))
+        self.tree.bind("<Button-4>", lambda e: self.scroll_to(self.first - WHEEL_ROWS))
+        self.tree.bind("<Button-5>", lambda e: self.scroll_to(self.first + WHEEL_ROWS))
+        self.tree.bind("<Prior>", lambda e: self.scroll_to(self.first - PAGE_ROWS))
+        self.tree.bind("<Next>", lambda e: self.scroll_to(self.first + PAGE_ROWS))
+        self.tree.bind("<Home>", lambda e: self.scroll_to(0))
+        self.tree.bind("<End>", lambda e: self.scroll_to(len(self.rows)))
+
+        self.items = [self.tree.insert("", tk.END, values=()) for _ in range(min(PAGE_ROWS, len(rows)))]
+        self.scroll_to(0)
+
+    def yview(self, *args):
+        # Scrollbar commands: ('moveto', fraction) or ('scroll', count, 'units' | 'pages')
+        if args[0] == 'moveto':
+            self.scroll_to(int(float(args[1]) * len(self.rows)))
+        elif args[0] == 'scroll':
+            self.scroll_to(self.first + int(args[1]) * (PAGE_ROWS if args[2] == 'pages' else 1))
+
+    def scroll_to(self, first: int):
+        total = len(self.rows)
+        self.first = max(0, min(first, total - len(self.items)))
+        page = format_page(self.rows.page(self.first, self.first + len(self.items), self.sort))
+        for item, values in zip(self.items, page):
+            self.tree.item(item, values=values)
+
+        shown = self.first + len(page)
+        self.scrollbar.set(self.first / total if total else 0.0, shown / total if total else 1.0)
+        self.status_var.set(f"Orders {self.first + 1:,}-{shown:,} of {total:,}" if total else "No orders")
+        return "break"
+
+    def sort_by(self, col: str):
+        # First click sorts ascending, the next one descending. The grid keeps showing and
+        # scrolling the current order until the new one is ready
+        sort = (col, self.sort is not None and self.sort == (col, False))
+        self.sorting = self.executor.submit(self.rows.order, col)
+        self.status_var.set(f"Sorting {len(self.rows):,} orders by {col}...")
+        self.window.after(SORT_POLL_MS, self.finish_sort, self.sorting, sort)
+
+    def finish_sort(self, future, sort: tuple[str, bool]):
+        # Only the last clicked heading is applied
+        if future is not self.sorting or not self.window.winfo_exists():
+            return
+        if not future.done():
+            self.window.after(SORT_POLL_MS, self.finish_sort, future, sort)
+            return
+        self.sorting = None
+        if future.exception() is not None:
+            print(f"Error: {future.exception()}")
+            self.scroll_to(self.first)
+            return
+
+        col, descending = self.sort = sort
+        for name in self.rows.columns:
+            arrow = (" ▼" if descending else " ▲") if name == col else ""
+            self.tree.heading(name, text=name + arrow)
+        self.scroll_to(0)
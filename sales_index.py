@@ -0,0 +1,102 @@
+import copy
+
+import numpy as np
+import pandas as pd
+
+# Columns offered as sidebar filters besides the Order Date range
+FILTER_COLS = ['Item Type', 'Sales Channel', 'Order Priority']
+
+# Columns of the bars a click drills into, besides Item Type
+DRILL_COLS = ['Region', 'Country']
+
+
+def group_rows(codes: np.ndarray, categories: int, first: int = 0) -> list[np.ndarray]:
+    # Positions of each code's rows, ascending. A stable sort keeps them in date order.
+    # Kept as int32 while they fit, every indexed column holds one position per row
+    order = np.argsort(codes, kind='stable')
+    bounds = np.searchsorted(codes[order], np.arange(categories + 1))
+    dtype = np.int32 if first + len(codes) <= np.iinfo(np.int32).max else np.int64
+    return [(first + order[bounds[code]:bounds[code + 1]]).astype(dtype) for code in range(categories)]
+
+
+class FilterIndex:
+    # Row indexes over a frame sorted by 'Order Date': a date range is a binary
+    # search, each category keeps the sorted positions of its rows
+    def __init__(self, df: pd.DataFrame, columns=FILTER_COLS + DRILL_COLS):
+        self.columns = list(columns)
+        self.dates = df['Order Date'].to_numpy()
+        self.codes = {}
+        self.categories = {}
+        self.rows = {}
+        for col in self.columns:
+            values = df[col].astype('category')
+            codes = values.cat.codes.to_numpy()
+            self.codes[col] = codes
+            self.categories[col] = list(values.cat.categories)
+            self.rows[col] = group_rows(codes, len(self.categories[col]))
+
+    def append(self, df: pd.DataFrame) -> 'FilterIndex':
+        # Index of the frame with df's rows added at the end, df sorted by date and no earlier
+        # than the last date. Only the new rows are grouped, the arrays of categories they
+        # don't touch are shared with this index
+        index = copy.copy(self)
+        first = len(self.dates)
+        index.dates = np.concatenate([self.dates, df['Order Date'].to_numpy()])
+        index.codes, index.categories, index.rows = dict(self.codes), dict(self.categories), dict(self.rows)
+        for col in self.columns:
+            values = df[col].to_numpy()
+            categories = pd.Index(self.categories[col])
+            codes = categories.get_indexer(values)
+            if (codes < 0).any():
+                # Categories first seen in df get the next codes
+                categories = categories.append(pd.Index(pd.unique(values[codes < 0])))
+                codes = categories.get_indexer(values)
+            dtype = np.result_type(self.codes[col].dtype, np.min_scalar_type(len(categories)))
+            index.codes[col] = np.concatenate([self.codes[col].astype(dtype, copy=False), codes.astype(dtype)])
+            index.categories[col] = list(categories)
+
+            rows = self.rows[col] + [np.empty(0, dtype=np.int32)] * (len(categories) - len(self.rows[col]))
+            for code, new in enumerate(group_rows(codes, len(categories), first)):
+                if len(new):
+                    rows[code] = np.concatenate([rows[code], new])
+            index.rows[col] = rows
+        return index
+
+    def date_range(self, start=None, end=None) -> slice:
+        lo = 0 if start is None else np.searchsorted(self.dates, np.datetime64(start), side='left')
+        hi = len(self.dates) if end is None else np.searchsorted(self.dates, np.datetime64(end), side='right')
+        return slice(int(lo), int(max(lo, hi)))
+
+    def category_codes(self, col, values) -> list[int]:
+        lookup = {value: code for code, value in enumerate(self.categories[col])}
+        return [lookup[value] for value in values if value in lookup]
+
+    def category_rows(self, col, values) -> np.ndarray:
+        # Union of the selected categories, merged back into ascending row order
+        parts = [self.rows[col][code] for code in self.category_codes(col, values)]
+        if len(parts) == 1:
+            return parts[0]
+        return np.sort(np.concatenate(parts)) if parts else np.empty(0, dtype=np.intp)
+
+    def select(self, start=None, end=None, filters: dict | None = None):
+        # Returns a slice when only the date range applies, otherwise sorted row positions
+        window = self.date_range(start, end)
+        filters = {col: values for col, values in (filters or {}).items() if values}
+        if not filters:
+            return window
+
+        # Start from the smallest category selection, clip it to the date window
+        # with binary search, then check the other filters with a code lookup
+        def size(col):
+            return sum(len(self.rows[col][code]) for code in self.category_codes(col, filters[col]))
+        driver = min(filters, key=size)
+        rows = self.category_rows(driver, filters[driver])
+        rows = rows[np.searchsorted(rows, window.start):np.searchsorted(rows, window.stop)]
+
+        for col, values in filters.items():
+            if col == driver:
+                continue
+            allowed = np.zeros(len(self.categories[col]), dtype=bool)
+            allowed[self.category_codes(col, values)] = True
+            rows = rows[allowed[self.codes[col][rows]]]
+        return rows
@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+
+# Level-of-detail helpers: pick a time grain for a date window and thin out series
+# so a chart never draws more than a fixed number of points, however many rows are behind it.
+
+# Time grains from coarse to fine with their pandas resample rule and average length in days
+GRAINS = {
+    'year': ('YS', 365.25),
+    'quarter': ('QS', 91.31),
+    'month': ('MS', 30.44),
+    'week': ('W-MON', 7),
+    'day': ('D', 1),
+}
+GRAIN_LABELS = {'quarter': '%YQ%q', 'month': '%Y-%m', 'week': '%Y-%m-%d', 'day': '%Y-%m-%d'}
+
+# Auto grain aims for about this many points in the visible window
+TARGET_POINTS = 150
+
+# Most points drawn for a line, bars drawn one by one and value labels per chart
+MAX_POINTS = 500
+MAX_BARS = 60
+MAX_ANNOTATIONS = 30
+
+
+def pick_grain(start: pd.Timestamp, end: pd.Timestamp, target: int = TARGET_POINTS) -> str:
+    # Finest grain that keeps the window within the target point count
+    days = max((end - start).days + 1, 1)
+    for grain in reversed(list(GRAINS)):
+        if days / GRAINS[grain][1] <= target:
+            return grain
+    return 'year'
+
+
+def resample(daily: pd.Series, grain: str) -> pd.Series:
+    rule = GRAINS[grain][0]
+    if grain == 'week':
+        return daily.resample(rule, label='left', closed='left').sum()
+    return daily.resample(rule).sum()
+
+
+def grain_labels(index: pd.DatetimeIndex, grain: str) -> list[str]:
+    if grain == 'quarter':
+        return [f'{d.year}Q{d.quarter}' for d in index]
+    return list(index.strftime(GRAIN_LABELS[grain]))
+
+
+def lttb(x: np.ndarray, y: np.ndarray, n: int = MAX_POINTS) -> np.ndarray:
+    # Largest-Triangle-Three-Buckets: positions of n points that keep the visual shape
+    # of the line, always including the first and the last point
+    size = len(x)
+    if n >= size or n < 3:
+        return np.arange(size)
+    x = np.asarray(x, dtype='float64')
+    y = np.asarray(y, dtype='float64')
+    edges = np.linspace(1, size - 1, n - 1).astype(np.int64)
+
+    keep = np.empty(n, dtype=np.int64)
+    keep[0], keep[-1] = 0, size - 1
+    a = 0
+    for i in range(n - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # The next bucket's average, the last bucket is followed by the last point only
+        nlo, nhi = (edges[i + 1], edges[i + 2]) if i + 2 < len(edges) else (size - 1, size)
+        avg_x, avg_y = x[nlo:nhi].mean(), y[nlo:nhi].mean()
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(area.argmax())
+        keep[i + 1] = a
+    return keep
+
+
+def minmax_buckets(values: np.ndarray, n: int) -> pd.DataFrame:
+    # Envelope of consecutive values in n buckets: bucket position range, min and max
+    values = np.asarray(values, dtype='float64')
+    edges = np.linspace(0, len(values), n + 1).astype(np.int64)
+    starts = edges[:-1][np.diff(edges) > 0]
+    ends = np.append(starts[1:], len(values))
+    return pd.DataFrame({
+        'x': (starts + ends - 1) / 2,
+        'min': np.minimum.reduceat(values, starts),
+        'max': np.maximum.reduceat(values, starts),
+    })
+
+
+def top_positions(values, limit: int = MAX_ANNOTATIONS) -> np.ndarray:
+    # Positions of the largest values by magnitude, in their original order
+    values = np.abs(np.asarray(values, dtype='float64'))
+    if len(values) <= limit:
+        return np.arange(len(values))
+    return np.sort(np.argpartition(values, -limit)[-limit:])
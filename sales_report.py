@@ -0,0 +1,130 @@
+import argparse
+import importlib.util
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import matplotlib
+matplotlib.use("Agg")
+from matplotlib.figure import Figure
+import pandas as pd
+
+from sales_cube import SalesCube
+from sales_data import (DATA_FILE, is_sharded, load_sales_cached, load_sales_csv, load_sales_shards, new_load_stats,
+                        print_load_stats, shard_paths)
+from sales_views import VIEWS
+
+# Headless batch renderer: every dashboard view, for every region, without Tk
+#
+#   python sales_report.py --data sales_export.csv --out reports --formats png pdf xlsx
+
+FORMATS = ['png', 'pdf', 'xlsx']
+SORT_ORDERS = ['none', 'ascending', 'descending']
+
+# Set once per worker process by init_worker
+_cube = None
+
+
+def init_worker(cube):
+    global _cube
+    _cube = cube
+
+
+def slug(text: str) -> str:
+    return re.sub(r'[^a-z0-9]+', '_', text.lower()).strip('_')
+
+
+def render_view(name, region, sort, formats, out_dir):
+    # Runs in a worker process: one view, one figure
+    view = VIEWS[name]
+    start = time.perf_counter()
+    result = view.compute(_cube, sort, region)
+    computed = time.perf_counter()
+
+    base = os.path.join(out_dir, slug(name if region is None else f'{name} {region}'))
+    fig = Figure(figsize=(10, 6))
+    view.draw(fig.add_subplot(), result)
+    fig.tight_layout()
+    for fmt in formats:
+        if fmt != 'xlsx':
+            fig.savefig(f'{base}.{fmt}')
+    with open(f'{base}.txt', 'w') as f:
+        f.write(result['summary'])
+    rendered = time.perf_counter()
+
+    return name, region, result, computed - start, rendered - computed
+
+
+def write_workbook(path, results):
+    with pd.ExcelWriter(path) as writer:
+        for name, region, result in results:
+            # Sheet names are limited to 31 characters, regions are unique on their own
+            sheet = (region or name)[:31]
+            result['data'].to_excel(writer, sheet_name=sheet)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render all dashboard views to files without a display")
+    parser.add_argument("--data", default=DATA_FILE, help="sales CSV to load, or a directory or glob of CSV shards")
+    parser.add_argument("--chunksize", type=int, default=500_000, help="rows per chunk when parsing the CSV")
+    parser.add_argument("--no-cache", action="store_true", help="always parse the CSV, skip the on-disk cache")
+    parser.add_argument("--rebuild-cache", action="store_true", help="re-parse the CSV and rewrite the on-disk cache")
+    parser.add_argument("--out", default="reports", help="output directory")
+    parser.add_argument("--formats", nargs="+", choices=FORMATS, default=['png'])
+    parser.add_argument("--views", nargs="+", choices=list(VIEWS), default=list(VIEWS), metavar="VIEW")
+    parser.add_argument("--regions", nargs="+", default=None, help="regions for Profit by Country (default: all)")
+    parser.add_argument("--sort", choices=SORT_ORDERS, default="descending")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    if 'xlsx' in args.formats and importlib.util.find_spec('openpyxl') is None:
+        parser.error("xlsx output needs openpyxl, install it with 'pip install openpyxl'")
+
+    start = time.perf_counter()
+    stats = new_load_stats()
+    if is_sharded(args.data):
+        df = load_sales_shards(shard_paths(args.data), args.chunksize, stats, not args.no_cache, args.rebuild_cache,
+                               args.workers)
+    elif args.no_cache:
+        df = load_sales_csv(args.data, args.chunksize, stats)
+    else:
+        df = load_sales_cached(args.data, args.chunksize, stats, args.rebuild_cache)
+    print_load_stats(stats)
+    cube = SalesCube(df)
+    del df
+    print(f"Loaded and aggregated in {time.perf_counter() - start:.2f}s")
+
+    regions = args.regions or cube.regions()
+    tasks = [(name, region) for name in args.views
+             for region in (regions if VIEWS[name].uses_region else [None])]
+    os.makedirs(args.out, exist_ok=True)
+
+    # Only the small cube is shipped to the workers, never the raw rows
+    start = time.perf_counter()
+    results = {}
+    timings = {}
+    with ProcessPoolExecutor(args.workers, initializer=init_worker, initargs=(cube,)) as pool:
+        futures = [pool.submit(render_view, name, region, args.sort, args.formats, args.out)
+                   for name, region in tasks]
+        for future in as_completed(futures):
+            name, region, result, compute_time, render_time = future.result()
+            results[name, region] = result
+            total = timings.setdefault(name, [0, 0.0, 0.0])
+            total[0] += 1
+            total[1] += compute_time
+            total[2] += render_time
+
+    if 'xlsx' in args.formats:
+        write_workbook(os.path.join(args.out, 'sales_report.xlsx'),
+                       [(name, region, results[name, region]) for name, region in tasks])
+
+    print(f"\n{'view':<22}{'files':>6}{'compute':>12}{'render':>12}")
+    for name in args.views:
+        count, compute_time, render_time = timings[name]
+        print(f"{name:<22}{count:>6}{compute_time * 1000:>10.1f}ms{render_time * 1000:>10.1f}ms")
+    print(f"\nRendered {len(tasks)} views to {args.out} in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
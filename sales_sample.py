@@ -0,0 +1,107 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from sales_cube import DIMENSIONS, MEASURES, SalesCube
+
+# Strata of the sample, every combination keeps its own rows so small groups are never lost
+STRATA = ['Region', 'Item Type']
+
+# Rows kept per stratum, strata with fewer rows are kept whole
+PER_STRATUM = 2000
+
+# Random draw of each row, the sample is the rows with the smallest draws per stratum
+SAMPLE_KEY = 'sample key'
+
+# Estimated cubes kept per filter set
+CUBES = 8
+
+
+def select_rows(rows: pd.DataFrame, filters) -> np.ndarray:
+    # Boolean mask of the dashboard filters (start, end, ((col, values), ...)) on a small frame
+    start, end, categories = filters
+    mask = np.ones(len(rows), dtype=bool)
+    if start is not None:
+        mask &= (rows['Order Date'] >= start).to_numpy()
+    if end is not None:
+        mask &= (rows['Order Date'] <= end).to_numpy()
+    for col, values in categories:
+        mask &= rows[col].isin(values).to_numpy()
+    return mask
+
+
+def weighted_sums(rows: pd.DataFrame, weight: np.ndarray, by: list[str]) -> pd.DataFrame:
+    # Horvitz-Thompson estimate: each sampled row stands for `weight` rows of its stratum
+    sums = rows[MEASURES].astype('float64').mul(weight, axis=0)
+    sums['count'] = weight
+    return sums.groupby([rows[col] for col in by], observed=True, sort=True).sum()
+
+
+class StratifiedSample:
+    # Bottom-k reservoir per Region/Item Type: every row draws a random key and each stratum
+    # keeps the rows with the k smallest keys. That is a uniform sample of the stratum, and
+    # merging new rows keeps it one without looking at the rows already dropped.
+    def __init__(self, df: pd.DataFrame | None = None, per_stratum: int = PER_STRATUM, seed: int = 0,
+                 rows: pd.DataFrame | None = None, sizes: pd.Series | None = None, rng=None):
+        self.per_stratum = per_stratum
+        self.rng = rng or np.random.default_rng(seed)
+        if rows is None:
+            rows, sizes = self.draw(df), df.groupby(STRATA, observed=True).size()
+        self.rows = rows
+        self.sizes = sizes
+
+        # Rows of the full data each sampled row stands for
+        sampled = rows.groupby(STRATA, observed=True)[SAMPLE_KEY].transform('size').to_numpy()
+        totals = sizes.reindex(pd.MultiIndex.from_frame(rows[STRATA])).to_numpy()
+        self.weight = totals / sampled
+
+        # Estimated cubes are memoized per filter set, the sample never changes once drawn
+        self._cubes = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def total_rows(self) -> int:
+        return int(self.sizes.sum())
+
+    def draw(self, df: pd.DataFrame) -> pd.DataFrame:
+        # Only the strata and the keys are ranked, the kept rows are then taken from df
+        keys = pd.Series(self.rng.random(len(df)), index=df.index)
+        keep = self.smallest_mask(df[STRATA].assign(**{SAMPLE_KEY: keys}))
+        return df[keep].assign(**{SAMPLE_KEY: keys[keep]})
+
+    def smallest_mask(self, rows: pd.DataFrame) -> np.ndarray:
+        ranks = rows.groupby(STRATA, observed=True)[SAMPLE_KEY].rank(method='first')
+        return (ranks <= self.per_stratum).to_numpy()
+
+    def smallest(self, rows: pd.DataFrame) -> pd.DataFrame:
+        return rows[self.smallest_mask(rows)]
+
+    def merge(self, df: pd.DataFrame) -> 'StratifiedSample':
+        # A new sample with the rows of df offered to every stratum's reservoir
+        rows = self.smallest(pd.concat([self.rows, self.draw(df)], ignore_index=True))
+        sizes = self.sizes.add(df.groupby(STRATA, observed=True).size(), fill_value=0)
+        return StratifiedSample(per_stratum=self.per_stratum, rows=rows, sizes=sizes, rng=self.rng)
+
+    def cube(self, filters=None) -> SalesCube:
+        # Estimated SalesCube of the rows passing the filters, same interface as the exact one
+        with self._lock:
+            if filters in self._cubes:
+                self._cubes.move_to_end(filters)
+                return self._cubes[filters]
+
+        rows, weight = self.rows, self.weight
+        if filters is not None:
+            mask = select_rows(rows, filters)
+            rows, weight = rows[mask], weight[mask]
+        cube = SalesCube(cells=weighted_sums(rows, weight, DIMENSIONS).reset_index(),
+                         daily=weighted_sums(rows, weight, ['Order Date']))
+
+        with self._lock:
+            self._cubes[filters] = cube
+            while len(self._cubes) > CUBES:
+                self._cubes.popitem(last=False)
+        return cube
@@ -0,0 +1,104 @@
+import json
+import os
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# Stages of one dashboard interaction, in the order they run
+STAGES = ['queue', 'filter', 'aggregate', 'plot', 'tight_layout', 'draw', 'widgets']
+
+# Startup milestones in the order they are reached, seconds from launch
+STARTUP_MILESTONES = {'window': 'window', 'imports': 'imports', 'data': 'data', 'kpis': 'KPIs', 'view': 'first view'}
+
+# Number of interactions the rolling percentiles are computed over
+WINDOW = 200
+PERCENTILES = [50, 90, 99]
+
+
+def rss_mib() -> float | None:
+    # Resident memory of this process, None where /proc is not available
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2**20
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class Interaction:
+    # Stage timings of one click, from the request to the widgets showing the result
+    def __init__(self, name: str):
+        self.name = name
+        self.cached = False
+        self.preview = False
+        self.stages = {}
+        self.start = time.perf_counter()
+        self.rss_start = rss_mib()
+
+    @contextmanager
+    def stage(self, stage: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - start)
+
+    def add(self, stage: str, seconds: float):
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.start
+
+
+class LatencyLog:
+    # Rolling per-stage latencies, each interaction is appended to the log file as one JSON line
+    def __init__(self, path: str | None = None, window: int = WINDOW):
+        self.path = path
+        self.window = window
+        self.samples = {}
+
+    def record(self, interaction: Interaction) -> dict:
+        stages = {stage: interaction.stages[stage] * 1000 for stage in STAGES if stage in interaction.stages}
+        total = interaction.elapsed() * 1000
+        for stage, ms in list(stages.items()) + [('total', total)]:
+            self.samples.setdefault(stage, deque(maxlen=self.window)).append(ms)
+
+        rss = rss_mib()
+        entry = {
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'view': interaction.name,
+            'cached': interaction.cached,
+            'preview': interaction.preview,
+            'total_ms': round(total, 3),
+            'stages_ms': {stage: round(ms, 3) for stage, ms in stages.items()},
+            'rss_mib': None if rss is None else round(rss, 1),
+            'rss_delta_mib': None if rss is None or interaction.rss_start is None else round(rss - interaction.rss_start, 1),
+            'percentiles_ms': self.percentiles(),
+        }
+        if self.path:
+            with open(self.path, 'a') as f:
+                f.write(json.dumps(entry) + '\n')
+        return entry
+
+    def percentiles(self) -> dict:
+        # Imported here, the dashboard imports this module before numpy has loaded
+        import numpy as np
+        return {stage: {f'p{p}': round(float(v), 3) for p, v in zip(PERCENTILES, np.percentile(samples, PERCENTILES))}
+                for stage, samples in self.samples.items()}
+
+
+def format_entry(entry: dict) -> str:
+    # One status bar line: the last interaction's breakdown and the rolling median and p90
+    stages = '  '.join(f'{stage} {ms:.1f}' for stage, ms in entry['stages_ms'].items())
+    total = entry['percentiles_ms']['total']
+    flags = ' (cached)' if entry['cached'] else ' (preview)' if entry.get('preview') else ''
+    text = f"{entry['view']}{flags}: {entry['total_ms']:.0f} ms  |  {stages}"
+    text += f"  |  p50 {total['p50']:.0f} ms  p90 {total['p90']:.0f} ms"
+    if entry['rss_mib'] is not None:
+        text += f"  |  RSS {entry['rss_mib']:.0f} MiB ({entry['rss_delta_mib']:+.1f})"
+    return text
+
+
+def format_startup(startup: dict) -> str:
+    # One line of seconds from launch to each startup milestone reached
+    marks = ', '.join(f'{label} {startup[key]:.2f}s' for key, label in STARTUP_MILESTONES.items() if key in startup)
+    return f'Startup: {marks}'
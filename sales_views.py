@@ -0,0 +1,410 @@
+import numpy as np
+import pandas as pd
+import matplotlib.dates as mdates
+import matplotlib.ticker as mtick
+
+from sales_cube import MONTH_NAMES
+from sales_format import NO_VALUE, format_BM, format_fixed, join_columns, text_column
+from sales_lod import (MAX_ANNOTATIONS, MAX_BARS, MAX_POINTS, grain_labels, lttb, minmax_buckets, pick_grain, resample,
+                       top_positions)
+
+# View logic shared by the Tk dashboard and the headless report engine.
+# compute_* functions aggregate from a SalesCube and build the summary text,
+# draw_* functions plot a result into a matplotlib Axes. Neither touches Tk or pyplot.
+# Callers run tight_layout on the figure once a view is drawn.
+
+# Region choice of Profit by Country that ranks the countries of every region
+ALL_REGIONS = "All Regions"
+
+# Rows listed in a summary table before the rest is cut off
+SUMMARY_ROWS = 200
+
+
+def add_BM(height,till=0,dol='$') -> str:
+    if np.isnan(height):
+        return NO_VALUE
+    if height >= 1_000_000_000:
+        label = f'{dol}{height // 1_000_000_000:.0f},{(height/10_000_000):.{till}f}M'
+    elif height>=1_000_000:
+        label = f'{dol}{height / 1_000_000:.{till}f}M'
+    else:
+        label= f'{dol}{height / 1_000_000:.1f}M' if height!=0 else f'{dol}{0}'
+    return label
+
+
+def annotate_bars(ax,dol='$',limit=None):
+    # With a limit only the tallest bars get a label
+    patches = ax.patches
+    if limit is not None and len(patches) > limit:
+        patches = [patches[i] for i in top_positions([bar.get_height() for bar in patches], limit)]
+    annotations = []
+    for bar in patches:
+        height = bar.get_height()
+        label=add_BM(height,1,dol) # add $ and M 
+        annotations.append(ax.annotate(label, 
+                    xy=(bar.get_x() + bar.get_width() / 2, bar.get_height()), 
+                    xytext=(0, 0), 
+                    textcoords="offset points", 
+                    ha='center', 
+                    va='bottom'))
+    return annotations
+
+
+def apply_sorting(data, sort)-> pd.Series:
+    if sort == "ascending":
+        return data.sort_values(ascending=True)
+    elif sort == "descending":
+        return data.sort_values(ascending=False)
+    return data
+
+
+def sort_with_col(data_col,col, sort) -> pd.DataFrame:
+    if sort == "ascending":
+        return data_col.sort_values(by=col,ascending=True)
+    elif sort == "descending":
+        return data_col.sort_values(by=col,ascending=False)
+    return data_col
+
+
+def create_table_str(table_name: str, series: pd.Series, col1_name: str, col2_name: str, col_width: int) -> str:
+    # Table title with formatting
+    table_title = f'{table_name}' 
+    # Create the header row with custom column names
+    header = f'| {col1_name:<{col_width}}|  {col2_name:<{col_width}}|'
+    separator = '+'+'-' * (len(header)-2)+'+'
+    rows = [table_title,separator , header, separator]
+
+    # Render each column at once instead of formatting row by row
+    if len(series):
+        rows += join_columns([text_column(series.index, col_width), text_column(series.values, col_width)], '|')
+
+    return '\n'.join(rows)+'\n'+ separator
+
+
+def cap_rows(data, limit=SUMMARY_ROWS):
+    # Long tables are cut off with a last row telling how many were left out
+    if len(data) <= limit:
+        return data
+    rest = pd.Series([f'{len(data) - limit} more'], index=['...'])
+    return pd.concat([data.iloc[:limit].astype(object), rest])
+
+
+def create_df_str(table_name: str, dataframe: pd.DataFrame, col1_name: str, all_column_names: list[str], col_width: int) -> str:
+    table_title = f'{table_name}'
+
+    header = f'| {col1_name:<{col_width}}|  '  
+    for col in all_column_names:
+        header += f'{col:<{col_width}}|  '
+
+    separator = '+'+'-' * (len(header)-4)+'+'
+
+    rows = [table_title,separator, header, separator]
+
+    # Render the index and each column as fixed-width text columns
+    if len(dataframe):
+        columns = [text_column(dataframe.index, col_width)]
+        columns += [text_column(dataframe[col], col_width) for col in all_column_names]
+        rows += join_columns(columns, '|  ')
+
+    # Join all rows into a single string with line breaks
+    return '\n'.join(rows)+'\n'+separator
+
+
+def compute_revenue_by_region(cube, sort, region):
+    data_grouped = cube.sum(['Region'], 'Total Revenue')
+    data_grouped = apply_sorting(data_grouped, sort)
+    summary = create_table_str("Revenue by Region:",format_BM(data_grouped, 2),'Region','Total Revenue',35)
+    return {'data': data_grouped, 'summary': summary}
+
+
+def draw_revenue_by_region(ax, result):
+    result['data'].plot(kind='bar', ax=ax)
+
+    # Set title and labels
+    ax.set_title('Revenue by Region')
+    ax.set_ylabel('Total Revenue')
+    ax.tick_params(axis='x', labelrotation=25)
+    for label in ax.get_xticklabels():
+        label.set_horizontalalignment('right')
+    # Format the y-axis to display revenue in $100.0M
+    ax.yaxis.set_major_formatter(mtick.FuncFormatter(lambda x, _: add_BM(x) ))
+
+    # Annotate bars
+    return annotate_bars(ax)
+
+
+def compute_profit_by_country(cube, sort, region, window=None):
+    # Select the countries of the selected region
+    by_country = cube.sum(['Region', 'Country'], 'Total Profit')
+    if region == ALL_REGIONS:
+        data_grouped = by_country.groupby(level='Country', observed=True).sum()
+    elif region in by_country.index.get_level_values('Region'):
+        data_grouped = by_country.xs(region, level='Region')
+    else:
+        data_grouped = by_country.iloc[:0].droplevel('Region')
+    data_grouped = apply_sorting(data_grouped, sort)
+
+    half_count = len(data_grouped) // 2
+    data_grouped = data_grouped.head(half_count)
+
+    def var_name()-> str:
+        if sort == "ascending":
+            return 'Bottom '
+        elif sort == "descending":
+            return 'Top '
+        return ""
+
+    summary = create_table_str(f"{var_name()}countries by profit in {region}:", cap_rows(format_BM(data_grouped, 2)), 'Country', 'Total Profit', 25)
+
+    # The chart shows a window of country ranks, past MAX_BARS countries as a min/max envelope
+    lo, hi = window or (0, len(data_grouped))
+    shown = data_grouped.iloc[lo:hi]
+    profile = minmax_buckets(shown.values, MAX_BARS * 4) if len(shown) > MAX_BARS else None
+    if profile is not None:
+        profile['x'] += lo
+    return {'data': data_grouped, 'region': region, 'summary': summary, 'window': (lo, hi), 'profile': profile}
+
+
+def draw_profit_by_country(ax, result):
+    lo, hi = result['window']
+    profile = result['profile']
+    if profile is not None:
+        ax.fill_between(profile['x'], profile['min'], profile['max'], step='mid', alpha=0.4)
+        ax.plot(profile['x'], profile['max'], drawstyle='steps-mid', linewidth=1)
+        ax.set_xlim(lo - 0.5, hi - 0.5)
+        ax.set_xlabel(f"Country rank ({hi - lo} countries, zoom in to see names)")
+    else:
+        result['data'].iloc[lo:hi].plot(kind='bar', ax=ax)
+
+    # Set title and labels
+    ax.set_title(f"Profit by Country in {result['region']}")
+    ax.set_ylabel('Total Profit')
+
+    # Format the y-axis to display profit in $100.0M
+    ax.yaxis.set_major_formatter(mtick.FuncFormatter(lambda x, _: add_BM(x)))
+    # Annotate bars
+    return None if profile is not None else annotate_bars(ax, limit=MAX_ANNOTATIONS)
+
+
+def country_window(result, x0, x1):
+    # Chart x positions to a window of country ranks, bars are drawn from the window start
+    offset = 0 if result['profile'] is not None else result['window'][0]
+    count = len(result['data'])
+    lo = max(0, int(np.floor(x0 + offset + 0.5)))
+    hi = min(count, max(int(np.ceil(x1 + offset + 0.5)), lo + 3))
+    return None if (lo, hi) == (0, count) else (lo, hi)
+
+
+def compute_sales_by_item(cube, sort, region):
+    data_grouped = cube.sum(['Item Type'], 'Units Sold')
+    data_grouped = apply_sorting(data_grouped, sort)
+
+    mk=pd.DataFrame({
+        'Units Sold': cube.sum(['Item Type'], 'Units Sold'),
+        'Unit Price': cube.mean(['Item Type'], 'Unit Price'),
+        'Unit Cost': cube.mean(['Item Type'], 'Unit Cost'),
+        'Total Profit': cube.sum(['Item Type'], 'Total Profit')
+    })
+
+    mk=sort_with_col(mk,'Total Profit', sort)
+    mk['Total Profit']=format_BM(mk['Total Profit'], 2)
+    mk['Unit Price']=np.char.add('$', format_fixed(mk['Unit Price'], 0))
+    mk['Unit Cost']=np.char.add('$', format_fixed(mk['Unit Cost'], 0))
+    mk['Units Sold']=format_BM(mk['Units Sold'], 2, "")
+
+    summary=create_df_str("Sales by Item Type:",mk,'Item Type',mk.columns,15)
+    return {'data': data_grouped, 'summary': summary}
+
+
+def draw_sales_by_item(ax, result):
+    result['data'].plot(kind='bar', ax=ax)
+
+    # Set title and labels
+    ax.set_title('Sales by Item')
+    ax.set_ylabel('Units Sold')
+    ax.tick_params(axis='x', labelrotation=25)
+    for label in ax.get_xticklabels():
+        label.set_horizontalalignment('right')
+    # Annotate bars
+    ax.yaxis.set_major_formatter(mtick.FuncFormatter(lambda x, _: add_BM(x,1,"") ))
+
+    return annotate_bars(ax,"")
+
+
+def compute_sales_over_time(cube, sort, region, detail=None):
+    # detail is (grain, window): a grain from GRAINS or 'auto', and an Order Date range or None
+    grain, window = detail or ('year', None)
+    if grain == 'year' and window is None:
+        data_grouped = cube.sum(['year'], 'Total Revenue')
+        sorted_grouped = apply_sorting(data_grouped, sort)
+        summary = create_table_str("Total Revenue Over Time:",format_BM(sorted_grouped, 2),'year','Total Revenue',15)
+        # First and last day the chart can zoom out to
+        span = (pd.Timestamp(data_grouped.index[0], 1, 1), pd.Timestamp(data_grouped.index[-1], 12, 31)) if len(data_grouped) else None
+        return {'data': data_grouped, 'summary': summary, 'grain': 'year', 'points': len(data_grouped), 'span': span}
+
+    daily = cube.by_day('Total Revenue')
+    if daily.empty:
+        return {'data': daily, 'summary': '', 'grain': grain, 'points': 0, 'span': None}
+    span = (daily.index[0], daily.index[-1])
+    start, end = window or span
+    if grain == 'auto':
+        grain = pick_grain(start, end)
+
+    if grain == 'year':
+        series = cube.sum(['year'], 'Total Revenue')
+        series = series[(series.index >= start.year) & (series.index <= end.year)]
+        labels = series.index
+    else:
+        series = resample(daily, grain)
+        # From the bucket holding the window start to the last one starting before its end
+        lo = max(series.index.searchsorted(start, side='right') - 1, 0)
+        series = series.iloc[lo:series.index.searchsorted(end, side='right')]
+        labels = grain_labels(series.index, grain)
+
+    # Decimated on the worker so drawing stays flat however long the range is
+    shown = series.iloc[lttb(np.arange(len(series)), series.values, MAX_POINTS)]
+
+    table = apply_sorting(pd.Series(series.values, index=labels), sort)
+    summary = create_table_str(f"Total Revenue by {grain.title()}:", cap_rows(format_BM(table, 2)), grain, 'Total Revenue', 15)
+    return {'data': shown, 'summary': summary, 'grain': grain, 'points': len(series), 'span': span}
+
+
+def draw_sales_over_time(ax, result):
+    data_grouped = result['data']
+    if result['grain'] != 'year':
+        return draw_time_series(ax, result)
+
+    data_grouped.plot(kind='line', ax=ax)
+    ax.plot(data_grouped.index, data_grouped.values, 'o', color='darkblue', markersize=8)
+    # Set title and labels
+    ax.set_title('Total Revenue Over Time')
+    ax.set_ylabel('Total Revenue')
+    ax.set_xlabel('Year')
+
+    # Format the y-axis to display revenue in $100.0M
+    ax.yaxis.set_major_formatter(mtick.FuncFormatter(lambda x, _: add_BM(x)))
+    for year, revenue in data_grouped.items():
+        ax.annotate(add_BM(revenue, 1), 
+                    xy=(year, revenue), 
+                    xytext=(0, 5),  # Offset the text slightly above the point
+                    textcoords='offset points', 
+                    ha='center', 
+                    va='bottom')
+
+
+def draw_time_series(ax, result):
+    data, grain = result['data'], result['grain']
+    ax.plot(data.index, data.values, linewidth=1.5, marker='o' if len(data) <= 60 else None, markersize=4)
+
+    title = f'Total Revenue by {grain.title()}'
+    if len(data) < result['points']:
+        title += f" ({len(data)} of {result['points']} points)"
+    ax.set_title(title)
+    ax.set_ylabel('Total Revenue')
+    ax.set_xlabel(grain.title())
+    ax.yaxis.set_major_formatter(mtick.FuncFormatter(lambda x, _: add_BM(x)))
+
+    # Only the largest points are labelled
+    for i in top_positions(data.values, MAX_ANNOTATIONS // 3):
+        ax.annotate(add_BM(data.values[i], 1), xy=(data.index[i], data.values[i]), xytext=(0, 5),
+                    textcoords='offset points', ha='center', va='bottom', fontsize=8)
+
+
+def time_window(result, x0, x1):
+    # Chart x range to an Order Date window: years on the yearly chart, matplotlib dates otherwise.
+    # The range is clamped to the data's first and last day, zooming far out shows all of it
+    if result['span'] is None:
+        return None
+    first, last = result['span']
+    if result['grain'] == 'year':
+        x0, x1 = np.clip([x0, x1], first.year, last.year)
+        start, end = pd.Timestamp(int(np.floor(x0)), 1, 1), pd.Timestamp(int(np.ceil(x1)), 12, 31)
+    else:
+        x0, x1 = np.clip([x0, x1], mdates.date2num(first), mdates.date2num(last))
+        start, end = (pd.Timestamp(mdates.num2date(x).replace(tzinfo=None)) for x in (x0, x1))
+    return max(start.floor('D'), first), min(end.floor('D'), last)
+
+
+def compute_sales_by_channel(cube, sort, region):
+    data_grouped = cube.sum(['Sales Channel'], 'Total Revenue')
+    data_grouped = apply_sorting(data_grouped, sort)
+    summary = create_table_str("Sales by Channel:",format_BM(data_grouped, 2),'Sales Channel','Total Revenue',20)
+    return {'data': data_grouped, 'summary': summary}
+
+
+def draw_sales_by_channel(ax, result):
+    result['data'].plot(kind='pie', autopct='%1.1f%%', ax=ax)
+    ax.set_title('Revenue by Channel')
+
+
+def compute_sales_by_month(cube, sort, region):
+    # Average 'Total Revenue' per 'Item Type' and month, with month numbers mapped to names
+    sales_per_year = cube.mean(['Item Type', 'month'], 'Total Revenue').unstack()
+    sales_per_year = sales_per_year.reindex(columns=range(1, 13))
+    sales_per_year.columns = pd.CategoricalIndex(MONTH_NAMES, categories=MONTH_NAMES, ordered=True, name='month')
+
+    table = sales_per_year
+    if sort == "ascending":
+        table = table.sort_index()
+    elif sort == "descending":
+        table = table.sort_index(ascending=False)
+
+    table = format_BM(table, 2)
+    # Generate the summary table
+    summary = create_df_str("Total Revenue by Month:", table, 'Month', table.columns, 12)
+    return {'data': sales_per_year, 'summary': summary}
+
+
+def draw_sales_by_month(ax, result):
+    sales_per_year = result['data']
+
+    # Define month order
+    month_order = MONTH_NAMES
+
+    # Plot each item's revenue across months
+    for item_type in sales_per_year.index:
+        ax.plot(month_order, sales_per_year.loc[item_type], marker='o', label=item_type, linewidth=2, markersize=6)
+
+    # Add title and labels
+    ax.set_title('Average Revenue by Item Type and Month')
+    ax.set_xlabel('Month', )
+    ax.set_ylabel('Total Revenue', fontsize=12)
+    # Customize tick parameters for better visibility
+    ax.yaxis.set_major_formatter(mtick.FuncFormatter(lambda x, _: add_BM(x,1)))
+    # ax.tick_params(axis='x', rotation=45, labelsize=10)
+    # ax.tick_params(axis='y', labelsize=10)
+
+    # Add legend for item types
+    ax.legend(title='Item Type',  fontsize='10', loc='upper left', bbox_to_anchor=(1, 1))
+
+    # Improve the grid visibility
+    ax.grid(True, linestyle='--', alpha=0.6)
+
+
+class View:
+    # zoom turns a chart x range into a window of the view's data, None for fixed views
+    def __init__(self, compute, draw, uses_region=False, bar_unit=None, zoom=None, uses_grain=False, drill=None):
+        self.compute = compute
+        self.draw = draw
+        # Only Profit by Country depends on the selected region
+        self.uses_region = uses_region
+        # Bar charts can be re-sorted in place, bar_unit is the prefix of their labels
+        self.bar_unit = bar_unit
+        # Zoomable views take a window as a fourth compute argument, the time series
+        # takes (grain, window)
+        self.zoom = zoom
+        self.uses_grain = uses_grain
+        # Column behind each bar, clicking a bar lists the orders with that value
+        self.drill = drill
+
+
+# Views in sidebar order, keyed by their button text
+VIEWS = {
+    "Revenue by Region": View(compute_revenue_by_region, draw_revenue_by_region, bar_unit='$', drill='Region'),
+    "Profit by Country": View(compute_profit_by_country, draw_profit_by_country, uses_region=True, bar_unit='$',
+                              zoom=country_window, drill='Country'),
+    "Sales by Item": View(compute_sales_by_item, draw_sales_by_item, bar_unit='', drill='Item Type'),
+    "Revenue Over Time": View(compute_sales_over_time, draw_sales_over_time, zoom=time_window, uses_grain=True),
+    "Sales by Channel": View(compute_sales_by_channel, draw_sales_by_channel),
+    "Sales by Month": View(compute_sales_by_month, draw_sales_by_month),
+}